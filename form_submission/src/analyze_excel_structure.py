@@ -45,9 +45,13 @@ def analyze_excel_structure(brand="Conway"):
         # Get the specific brand worksheet
         worksheet = workbook[brand]
         
+        # max_row/max_column scan every cell on each access, so read them once
+        max_row = worksheet.max_row
+        max_column = worksheet.max_column
+        
         logger.info(f"Analyzing {brand} sheet:")
-        logger.info(f"Max row (openpyxl): {worksheet.max_row}")
-        logger.info(f"Max column (openpyxl): {worksheet.max_column}")
+        logger.info(f"Max row (openpyxl): {max_row}")
+        logger.info(f"Max column (openpyxl): {max_column}")
         
         # Count rows with data vs empty rows
         rows_with_data = 0
@@ -55,8 +59,8 @@ def analyze_excel_structure(brand="Conway"):
         last_data_row = 1
         
         # Sample every 10th row to find patterns
-        sample_rows = list(range(1, min(worksheet.max_row + 1, 100))) + \
-                      list(range(100, worksheet.max_row + 1, 10))
+        sample_rows = list(range(1, min(max_row + 1, 100))) + \
+                      list(range(100, max_row + 1, 10))
         
         logger.info("Sampling rows to find data patterns:")
         
@@ -72,11 +76,11 @@ def analyze_excel_structure(brand="Conway"):
             if has_data:
                 rows_with_data += 1
                 last_data_row = row
-                if row <= 20 or row % 100 == 0 or row > worksheet.max_row - 10:
+                if row <= 20 or row % 100 == 0 or row > max_row - 10:
                     logger.info(f"Row {row}: HAS DATA")
             else:
                 empty_rows += 1
-                if row <= 20 or row % 100 == 0 or row > worksheet.max_row - 10:
+                if row <= 20 or row % 100 == 0 or row > max_row - 10:
                     logger.info(f"Row {row}: EMPTY")
         
         logger.info(f"Summary of sampled rows:")
@@ -95,7 +99,7 @@ def analyze_excel_structure(brand="Conway"):
                 logger.info(f" - Merged range {i+1}: {merged}")
         
         # Check if there are any cells with formatting but no data in high rows
-        test_rows = [worksheet.max_row - i for i in range(5)]
+        test_rows = [max_row - i for i in range(5)]
         logger.info(f"Checking formatting in last 5 rows: {test_rows}")
         
         for row in test_rows:
@@ -5,6 +5,7 @@ Find where actual data starts and ends in the Excel file
 
 import os
 import sys
+from collections import deque
 from dotenv import load_dotenv
 
 # Import our modules
@@ -35,8 +36,8 @@ def find_actual_data(brand="Conway"):
         # Download existing Excel file
         excel_file = download_excel_from_dropbox(access_token, file_path)
         
-        # Load workbook with openpyxl
-        workbook = load_workbook(excel_file, data_only=True)
+        # Load workbook in read-only mode; this is a single streaming scan and nothing is written back
+        workbook = load_workbook(excel_file, read_only=True, data_only=True)
         
         if brand not in workbook.sheetnames:
             logger.error(f"Sheet '{brand}' not found in Excel file")
@@ -49,12 +50,20 @@ def find_actual_data(brand="Conway"):
         
         # Find first and last row with ticket ID data
         ticket_id_rows = []
+        first_rows = []
+        last_rows = deque(maxlen=3)
         
-        # Check every row for Ticket ID in column A
-        for row in range(1, worksheet.max_row + 1):
-            ticket_id = worksheet.cell(row=row, column=1).value
+        # Stream columns A-D once, checking for Ticket ID in column A and keeping the rows shown below
+        for row, (ticket_id, estado, _, empresa) in enumerate(worksheet.iter_rows(min_col=1, max_col=4, values_only=True), 1):
             if ticket_id and str(ticket_id).strip() and ticket_id != 'Ticket ID':
                 ticket_id_rows.append(row)
+                summary = (row, ticket_id, estado, empresa)
+                if len(first_rows) < 3:
+                    first_rows.append(summary)
+                last_rows.append(summary)
+        
+        # All values needed are captured, release the read-only file handle
+        workbook.close()
         
         if not ticket_id_rows:
             logger.error("No ticket ID data found!")
@@ -72,17 +81,11 @@ def find_actual_data(brand="Conway"):
         
         # Show first few and last few data rows
         logger.info(f"First 3 data rows:")
-        for i, row in enumerate(ticket_id_rows[:3]):
-            ticket_id = worksheet.cell(row=row, column=1).value
-            estado = worksheet.cell(row=row, column=2).value
-            empresa = worksheet.cell(row=row, column=4).value
+        for row, ticket_id, estado, empresa in first_rows:
             logger.info(f"  Row {row}: {ticket_id} | {estado} | {empresa}")
         
         logger.info(f"Last 3 data rows:")
-        for i, row in enumerate(ticket_id_rows[-3:]):
-            ticket_id = worksheet.cell(row=row, column=1).value
-            estado = worksheet.cell(row=row, column=2).value
-            empresa = worksheet.cell(row=row, column=4).value
+        for row, ticket_id, estado, empresa in last_rows:
             logger.info(f"  Row {row}: {ticket_id} | {estado} | {empresa}")
         
         # Check for gaps in the data
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP sessions
+Pooled requests sessions reused by the attachment downloads
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def create_session() -> requests.Session:
+    """
+    Create a requests session with connection pooling and retries
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+
+    # Dropbox rate limits (429) and transient gateway errors are retried with backoff.
+    # Every Dropbox API call is a POST, so POST has to be allowed explicitly.
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=frozenset(['GET', 'HEAD', 'POST']),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': 'warranty/1.0'})
+
+    return session
+
+# Module-level session so keep-alive connections are shared across calls.
+# Code running on another thread at the same time should use get_thread_session().
+session = create_session()
+
+_local = threading.local()
+
+def get_thread_session() -> requests.Session:
+    """
+    Get the calling thread's own session, creating it on first use
+    
+    requests.Session is not documented as thread-safe, so worker threads
+    each keep their own session instead of sharing the module-level one.
+    
+    Returns:
+        requests.Session for the current thread
+    """
+    thread_session = getattr(_local, 'session', None)
+    if thread_session is None:
+        thread_session = _local.session = create_session()
+    return thread_session
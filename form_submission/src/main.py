@@ -7,10 +7,13 @@ Handles webhook data from Tally forms and processes warranty submissions
 import json
 import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 # Import logging filter from root directory
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 from log_filter import setup_secure_logging
 
 from warranty_form_data import WarrantyFormData
@@ -28,7 +31,7 @@ def process_warranty_form(webhook_data):
     1. Generating unique ticket ID
     2. Parsing form data with WarrantyFormData class
     3. Sending confirmation email to client
-    4. Updating Excel file in Dropbox
+    4. Updating Excel file in Dropbox (in the background while the emails are sent)
     5. Sending notification email to admin
     """
     
@@ -75,6 +78,11 @@ def process_warranty_form(webhook_data):
         'conway_notification': False
     }
     
+    # Step 2 runs in the background: the Dropbox download, edit and upload do not depend on the emails
+    logger.info("Updating Excel file in Dropbox")
+    excel_executor = ThreadPoolExecutor(max_workers=1)
+    excel_future = excel_executor.submit(update_excel_file, form_data)
+    
     # Step 1: Send confirmation email to client
     logger.info("Sending confirmation email to client")
     try:
@@ -86,16 +94,17 @@ def process_warranty_form(webhook_data):
     except Exception as e:
         logger.error(f"Error sending confirmation email: {str(e)}")
     
-    # Step 2: Update Excel file in Dropbox
-    logger.info("Updating Excel file in Dropbox")
+    # Step 2: Wait for the Excel update, the admin email reports it and the Conway status update needs the new row
     try:
-        results['excel_update'] = update_excel_file(form_data)
+        results['excel_update'] = excel_future.result()
         if results['excel_update']:
             logger.info("Excel file updated successfully")
         else:
             logger.error("Failed to update Excel file")
     except Exception as e:
         logger.error(f"Error updating Excel file: {str(e)}")
+    finally:
+        excel_executor.shutdown()
     
     # Step 3: Send notification email to admin
     logger.info("Sending notification email to admin")
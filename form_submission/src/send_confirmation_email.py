@@ -1,6 +1,5 @@
 import os
 import json
-import smtplib
 import sys
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -9,9 +8,12 @@ from dotenv import load_dotenv
 
 # Import logging filter from root directory
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 from log_filter import setup_secure_logging
-from warranty_form_data import WarrantyFormData
+from warranty_form_data import WarrantyFormData, NOT_APPLICABLE
+from smtp_pool import smtp_pool
 
 load_dotenv()
 
@@ -33,10 +35,7 @@ def set_brand_logo(form_data: WarrantyFormData):
 def create_confirmation_email(form_data: WarrantyFormData):
     """Create confirmation email content using WarrantyFormData object"""
     
-    # Get all data from the form_data object
-    data = form_data.to_dict()
-    
-    fecha_creacion = data['fecha_creacion']
+    fecha_creacion = form_data.fecha_creacion
     
     html_content = f"""
     <html>
@@ -65,11 +64,11 @@ def create_confirmation_email(form_data: WarrantyFormData):
                 {set_brand_logo(form_data)}
                 <li><strong>Marca:</strong> {form_data.brand}</li>
                 <li><strong>Modelo:</strong> {form_data.modelo}</li>
-                {"<li><strong>Talla:</strong> " + form_data.talla + "</li>" if form_data.talla != 'No aplicable' else ""}
-                {"<li><strong>Año de fabricación:</strong> " + form_data.año + "</li>" if form_data.año != 'No aplicable' else ""}
+                {"<li><strong>Talla:</strong> " + form_data.talla + "</li>" if form_data.talla != NOT_APPLICABLE else ""}
+                {"<li><strong>Año de fabricación:</strong> " + form_data.año + "</li>" if form_data.año != NOT_APPLICABLE else ""}
                 <li><strong>Estado:</strong> {form_data.estado}</li>
                 <li><strong>Descripción del problema:</strong> {form_data.problema}</li>
-                {"<li><strong>Solución propuesta:</strong> " + form_data.solucion + "</li>" if form_data.solucion != 'No aplicable' else ""}
+                {"<li><strong>Solución propuesta:</strong> " + form_data.solucion + "</li>" if form_data.solucion != NOT_APPLICABLE else ""}
             </ul>
         </div>
         
@@ -114,10 +113,8 @@ def send_confirmation_email(form_data: WarrantyFormData):
         html_part = MIMEText(html_content, 'html', 'utf-8')
         msg.attach(html_part)
         
-        # Send email
-        with smtplib.SMTP_SSL(smtp_host, smtp_port) as server:
-            server.login(smtp_username, smtp_password)
-            server.send_message(msg)
+        # Send email over the pooled SMTP connection
+        smtp_pool.send_message(smtp_host, smtp_port, smtp_username, smtp_password, msg)
             
         logger.info(f"Confirmation email sent successfully to client")
         return True
@@ -1,8 +1,7 @@
 import os
 import json
-import smtplib
 import sys
-import requests
+import shutil
 import tempfile
 import mimetypes
 from email.mime.text import MIMEText
@@ -11,22 +10,39 @@ from email.mime.base import MIMEBase
 from email import encoders
 from datetime import datetime
 from dotenv import load_dotenv
-from googletrans import Translator
 from urllib.parse import urlparse
 
 # Import logging filter from root directory
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 from log_filter import setup_secure_logging
 from warranty_form_data import WarrantyFormData
+from http_session import session
+from smtp_pool import smtp_pool
 
 load_dotenv()
 
 # Set up secure logging
 logger = setup_secure_logging('conway_notification_email')
 
-# Initialize translator
-translator = Translator()
+# Translator is created on first use; googletrans is only needed when a Conway ticket is processed
+_translator = None
+
+# Read size used when streaming attachment downloads
+DOWNLOAD_CHUNK_SIZE = 128 * 1024
+
+# Load the system MIME type tables up front instead of on the first attachment
+mimetypes.init()
+
+def get_translator():
+    """Get the shared translator, importing googletrans on first use"""
+    global _translator
+    if _translator is None:
+        from googletrans import Translator
+        _translator = Translator()
+    return _translator
 
 def translate_text(text, target_lang='en'):
     """Translate text to target language with error handling"""
@@ -35,6 +51,7 @@ def translate_text(text, target_lang='en'):
             return text
         
         # Detect source language and translate if not already English
+        translator = get_translator()
         detection = translator.detect(text)
         if detection.lang != target_lang:
             result = translator.translate(text, dest=target_lang)
@@ -52,17 +69,16 @@ def translate_text(text, target_lang='en'):
 def download_file_from_url(url, filename):
     """Download file from URL and save to temporary file"""
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False)
-        
-        # Write content to temporary file
-        for chunk in response.iter_content(chunk_size=8192):
-            temp_file.write(chunk)
-        
-        temp_file.close()
+        with session.get(url, stream=True) as response:
+            response.raise_for_status()
+            
+            # Create temporary file
+            temp_file = tempfile.NamedTemporaryFile(delete=False)
+            
+            # Write content to temporary file
+            with temp_file:
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, temp_file, DOWNLOAD_CHUNK_SIZE)
         
         logger.info(f"Downloaded file: {filename} from {url}")
         return temp_file.name
@@ -74,9 +90,7 @@ def download_file_from_url(url, filename):
 def create_conway_notification_email(form_data: WarrantyFormData):
     """Create Conway notification email content using WarrantyFormData object"""
     
-    # Get data from form_data object
-    data = form_data.to_dict()
-    fecha_creacion = data['fecha_creacion']
+    fecha_creacion = form_data.fecha_creacion
     ticket_id = form_data.ticket_id
     
     # Conway-specific data extraction
@@ -265,19 +279,15 @@ def send_conway_notification_email(form_data: WarrantyFormData):
         
         # Send email
         logger.info("Attempting to send Conway notification email...")
-        with smtplib.SMTP_SSL(smtp_host, smtp_port) as server:
-            logger.info("SMTP connection established")
-            server.login(smtp_username, smtp_password)
-            logger.info("SMTP login successful")
-            
-            send_result = server.send_message(msg)
-            logger.info(f"SMTP send_message result: {send_result}")
-            
-            # Check if send_message returned any failed recipients
-            if send_result:
-                logger.warning(f"Some recipients failed: {send_result}")
-            else:
-                logger.info("All recipients accepted successfully")
+        # Send over the pooled SMTP connection, reusing the login of the earlier emails
+        send_result = smtp_pool.send_message(smtp_host, smtp_port, smtp_username, smtp_password, msg)
+        logger.info(f"SMTP send_message result: {send_result}")
+        
+        # Check if send_message returned any failed recipients
+        if send_result:
+            logger.warning(f"Some recipients failed: {send_result}")
+        else:
+            logger.info("All recipients accepted successfully")
             
         logger.info(f"Conway notification email sent successfully")
         return True
@@ -1,55 +1,104 @@
 import os
 import json
-import smtplib
 import sys
-import requests
-import tempfile
+import html
+import shutil
 import mimetypes
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from datetime import datetime
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Import logging filter from root directory
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 from log_filter import setup_secure_logging
-from warranty_form_data import WarrantyFormData
+from warranty_form_data import WarrantyFormData, NOT_SPECIFIED, NOT_APPLICABLE
+from http_session import get_thread_session
+from smtp_pool import smtp_pool
 
 load_dotenv()
 
 # Set up secure logging
 logger = setup_secure_logging('notification_email')
 
+# Read size used when streaming attachment downloads
+DOWNLOAD_CHUNK_SIZE = 128 * 1024
+
+# Load the system MIME type tables up front instead of on the first attachment
+mimetypes.init()
+
+# Maximum number of attachments downloaded at the same time
+MAX_PARALLEL_DOWNLOADS = 8
+
+# Files above this size are linked in the email body instead of attached (base64 adds ~33%)
+MAX_ATTACHMENT_BYTES = int(os.getenv('MAX_ATTACHMENT_BYTES', 20 * 1024 * 1024))
+
 def get_file_urls_from_form_data(file_list):
     """Extract file URLs from WarrantyFormData file list"""
     urls = []
     for file_info in file_list:
         urls.append({
             'url': file_info.url,
-            'name': file_info.name
+            'name': file_info.name,
+            'size': file_info.size
         })
     return urls
 
-def download_file_from_url(url, filename):
-    """Download file from URL and save to temporary file"""
+def get_remote_file_size(url):
+    """Get the file size announced by the server, or 0 if it is unknown"""
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False)
-        
-        # Write content to temporary file
-        for chunk in response.iter_content(chunk_size=8192):
-            temp_file.write(chunk)
-        
-        temp_file.close()
+        response = get_thread_session().head(url, allow_redirects=True)
+        # An error page's Content-Length says nothing about the file
+        if not response.ok:
+            logger.warning(f"Size check for {url} returned HTTP {response.status_code}")
+            return 0
+        return int(response.headers.get('Content-Length', 0))
+    except Exception as e:
+        logger.warning(f"Failed to check size of {url}: {str(e)}")
+        return 0
+
+def get_file_size(file_info):
+    """Get a file's size from the form payload, asking the server only if the payload has none"""
+    size = file_info.get('size')
+    if isinstance(size, (int, float)) and size > 0:
+        return int(size)
+    return get_remote_file_size(file_info['url'])
+
+def split_files_by_size(all_files):
+    """Split files into those small enough to attach and those that are only linked"""
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_DOWNLOADS) as executor:
+        sizes = list(executor.map(get_file_size, all_files))
+    
+    attachments = []
+    large_files = []
+    for file_info, size in zip(all_files, sizes):
+        if size > MAX_ATTACHMENT_BYTES:
+            logger.info(f"File {file_info['name']} is {size} bytes, linking instead of attaching")
+            large_files.append({**file_info, 'size': size})
+        else:
+            attachments.append(file_info)
+    
+    return attachments, large_files
+
+def download_file_bytes(url, filename):
+    """Download file from URL into memory and return its content as bytes"""
+    try:
+        with get_thread_session().get(url, stream=True) as response:
+            response.raise_for_status()
+            
+            # Stream content straight into memory, the attachment is used only once
+            buffer = BytesIO()
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, buffer, DOWNLOAD_CHUNK_SIZE)
         
         logger.info(f"Downloaded file: {filename} from {url}")
-        return temp_file.name
+        return buffer.getvalue()
         
     except Exception as e:
         logger.error(f"Failed to download file {filename} from {url}: {str(e)}")
@@ -67,66 +116,55 @@ def set_brand_logo(form_data: WarrantyFormData):
     else:
         return "<img src='https://static.wixstatic.com/media/3744a0_1a3cb44fb2dd4e029d937ba13930e693~mv2.png' alt='Proffectiv Logo' style='width: auto; height: 40px; padding-bottom: 10px;'>"
 
-def create_notification_email(form_data: WarrantyFormData):
-    """Create notification email content using WarrantyFormData object"""
-    
-    # Get data from form_data object
-    data = form_data.to_dict()
-    fecha_creacion = data['fecha_creacion']
+# Static parts of the admin notification are built once at import, only the body is filled per ticket
+NOTIFICATION_EMAIL_PRELUDE = """
+    <html>
     
-    # Determine if invoices are attached
-    factura_compra = 'Sí' if len(form_data.factura_compra) > 0 else 'No'
-    factura_venta = 'Sí' if len(form_data.factura_venta) > 0 else 'No'
-    fotos_problema = 'Sí' if len(form_data.fotos_problema) > 0 else 'No'
-    videos_problema = 'Sí' if len(form_data.videos_problema) > 0 else 'No'
-
-    style = """
     <style>
         body {
             color: #000000;
         }
     </style>
-    """
     
-    html_content = f"""
-    <html>
-    {style}
     <body>
         <h2>Nueva Solicitud de Garantía Recibida</h2>
 
         <h3><a href="https://www.dropbox.com/home/GARANTIAS">Acceder al documento de gestión de garantías</a></h3>
         
+        """
+
+NOTIFICATION_EMAIL_BODY = """
         <div style="background-color: #e3f2fd; padding: 15px; border-left: 4px solid #1976D2; margin: 20px 0;">
             <h3>Ticket de Garantía</h3>
-            <p><strong style="font-size: 18px; color: #1976D2;">Ticket ID: {form_data.ticket_id}</strong></p>
+            <p><strong style="font-size: 18px; color: #1976D2;">Ticket ID: {ticket_id}</strong></p>
         </div>
         
         <div style="background-color: #e8f4fd; padding: 15px; border-left: 4px solid #2196F3; margin: 20px 0;">
             <h3>Información General</h3>
             <ul>
                 <li><strong>Fecha y Hora:</strong> {fecha_creacion}</li>
-                <li><strong>Empresa:</strong> {form_data.empresa}</li>
-                <li><strong>NIF/CIF/VAT:</strong> {form_data.nif_cif}</li>
-                <li><strong>Email:</strong> {form_data.email}</li>
+                <li><strong>Empresa:</strong> {empresa}</li>
+                <li><strong>NIF/CIF/VAT:</strong> {nif_cif}</li>
+                <li><strong>Email:</strong> {email}</li>
             </ul>
         </div>
         
         <div style="background-color: #fff3e0; padding: 15px; border-left: 4px solid #FF9800; margin: 20px 0;">
             <h3>Información del Producto</h3>
             <ul>
-                {set_brand_logo(form_data)}
-                <li><strong>Marca:</strong> {form_data.brand}</li>
-                <li><strong>Modelo:</strong> {form_data.modelo}</li>
-                {"<li><strong>Talla:</strong> " + form_data.talla + "</li>" if form_data.talla != 'No aplicable' else ""}
-                {"<li><strong>Año de fabricación:</strong> " + form_data.año + "</li>" if form_data.año != 'No aplicable' else ""}
-                <li><strong>Estado del producto:</strong> {form_data.estado}</li>
+                {brand_logo}
+                <li><strong>Marca:</strong> {brand}</li>
+                <li><strong>Modelo:</strong> {modelo}</li>
+                {talla_item}
+                {año_item}
+                <li><strong>Estado del producto:</strong> {estado}</li>
             </ul>
         </div>
         
         <div style="background-color: #ffebee; padding: 15px; border-left: 4px solid #f44336; margin: 20px 0;">
             <h3>Problema Reportado</h3>
-            <p>{form_data.problema if form_data.problema != 'No especificado' else ''}</p>
-            {"<h3>Solución Propuesta:</h3><p>" + form_data.solucion + "</p>" if form_data.solucion != 'No aplicable' else ""}
+            <p>{problema}</p>
+            {solucion_block}
         </div>
         
         <div style="background-color: #f3e5f5; padding: 15px; border-left: 4px solid #9c27b0; margin: 20px 0;">
@@ -137,6 +175,7 @@ def create_notification_email(form_data: WarrantyFormData):
                 <li><strong>Imágenes:</strong> {fotos_problema}</li>
                 <li><strong>Vídeos:</strong> {videos_problema}</li>
             </ul>
+            {large_files_block}
         </div>
         
         <div style="background-color: #e8f5e8; padding: 15px; border-left: 4px solid #4caf50; margin: 20px 0;">
@@ -144,11 +183,14 @@ def create_notification_email(form_data: WarrantyFormData):
             <ul>
                 <li>✓ Notificación de nuevo ticket generada</li>
                 <li>✓ Email de confirmación enviado al cliente</li>
-                {"<li>✓ Solicitud de garantía enviada a Conway</li>" if form_data.is_conway() else ""}
+                {conway_item}
                 <li>✓ Registro añadido al archivo de Excel en Dropbox</li>   
             </ul>
         </div>
         
+        """
+
+NOTIFICATION_EMAIL_EPILOGUE = """
         <hr>
         
         <p>Este mensaje ha sido generado automáticamente por el sistema de gestión de garantías de PROFFECTIV.</p>
@@ -162,14 +204,65 @@ def create_notification_email(form_data: WarrantyFormData):
     </body>
     </html>
     """
+
+def create_notification_email(form_data: WarrantyFormData, large_files=None):
+    """Create notification email content using WarrantyFormData object and links to files too large to attach"""
+    
+    fecha_creacion = form_data.fecha_creacion
     
-    return html_content
+    # Optional sections are rendered here so the template stays free of logic
+    talla = form_data.talla
+    año = form_data.año
+    solucion = form_data.solucion
+    problema = form_data.problema
+    
+    large_files_block = ""
+    if large_files:
+        items = "".join(
+            f'<li><a href="{html.escape(file_info["url"])}">{html.escape(file_info["name"])}</a> ({file_info["size"] // 1024 // 1024} MB)</li>'
+            for file_info in large_files
+        )
+        large_files_block = f"<h4>Archivos demasiado grandes para adjuntar:</h4><ul>{items}</ul>"
+    
+    body = NOTIFICATION_EMAIL_BODY.format(
+        ticket_id=form_data.ticket_id,
+        fecha_creacion=fecha_creacion,
+        empresa=form_data.empresa,
+        nif_cif=form_data.nif_cif,
+        email=form_data.email,
+        brand_logo=set_brand_logo(form_data),
+        brand=form_data.brand,
+        modelo=form_data.modelo,
+        talla_item=f"<li><strong>Talla:</strong> {talla}</li>" if talla != NOT_APPLICABLE else "",
+        año_item=f"<li><strong>Año de fabricación:</strong> {año}</li>" if año != NOT_APPLICABLE else "",
+        estado=form_data.estado,
+        problema=problema if problema != NOT_SPECIFIED else '',
+        solucion_block=f"<h3>Solución Propuesta:</h3><p>{solucion}</p>" if solucion != NOT_APPLICABLE else "",
+        # Determine if invoices are attached
+        factura_compra='Sí' if len(form_data.factura_compra) > 0 else 'No',
+        factura_venta='Sí' if len(form_data.factura_venta) > 0 else 'No',
+        fotos_problema='Sí' if len(form_data.fotos_problema) > 0 else 'No',
+        videos_problema='Sí' if len(form_data.videos_problema) > 0 else 'No',
+        large_files_block=large_files_block,
+        conway_item="<li>✓ Solicitud de garantía enviada a Conway</li>" if form_data.is_conway() else ""
+    )
+    
+    return "".join((NOTIFICATION_EMAIL_PRELUDE, body, NOTIFICATION_EMAIL_EPILOGUE))
 
 def send_notification_email(form_data: WarrantyFormData):
     """Send notification email to admin using WarrantyFormData object"""
-    downloaded_files = []
     try:
-        html_content = create_notification_email(form_data)
+        # Get all files from form_data (invoices, images, videos)
+        all_files = []
+        all_files.extend(get_file_urls_from_form_data(form_data.factura_compra))
+        all_files.extend(get_file_urls_from_form_data(form_data.factura_venta))
+        all_files.extend(get_file_urls_from_form_data(form_data.fotos_problema))
+        all_files.extend(get_file_urls_from_form_data(form_data.videos_problema))
+        
+        # Check sizes first so oversized files are linked and never downloaded
+        attachments, large_files = split_files_by_size(all_files)
+        
+        html_content = create_notification_email(form_data, large_files)
         
         # Email configuration
         smtp_host = os.getenv('SMTP_HOST')
@@ -208,73 +301,56 @@ def send_notification_email(form_data: WarrantyFormData):
         
         # Download and attach files from form_data
         try:
-            # Get all files from form_data (invoices, images, videos)
-            all_files = []
-            all_files.extend(get_file_urls_from_form_data(form_data.factura_compra))
-            all_files.extend(get_file_urls_from_form_data(form_data.factura_venta))
-            all_files.extend(get_file_urls_from_form_data(form_data.fotos_problema))
-            all_files.extend(get_file_urls_from_form_data(form_data.videos_problema))
+            # Download all files concurrently; results come back in the original order
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_DOWNLOADS) as executor:
+                downloads = list(executor.map(
+                    lambda file_info: download_file_bytes(file_info['url'], file_info['name']),
+                    attachments
+                ))
             
             # Process each file
-            for file_info in all_files:
-                temp_file_path = download_file_from_url(file_info['url'], file_info['name'])
-                if temp_file_path:
-                    downloaded_files.append(temp_file_path)
+            for file_info, file_data in zip(attachments, downloads):
+                if file_data is not None:
+                    # Guess the content type based on the file's name
+                    ctype, encoding = mimetypes.guess_type(file_info['name'])
+                    if ctype is None or encoding is not None:
+                        ctype = 'application/octet-stream'
+                    
+                    maintype, subtype = ctype.split('/', 1)
                     
                     # Attach file to email
-                    with open(temp_file_path, 'rb') as attachment:
-                        # Guess the content type based on the file's name
-                        ctype, encoding = mimetypes.guess_type(file_info['name'])
-                        if ctype is None or encoding is not None:
-                            ctype = 'application/octet-stream'
-                        
-                        maintype, subtype = ctype.split('/', 1)
-                        
-                        part = MIMEBase(maintype, subtype)
-                        part.set_payload(attachment.read())
-                        encoders.encode_base64(part)
-                        
-                        part.add_header(
-                            'Content-Disposition',
-                            f'attachment; filename= {file_info["name"]}'
-                        )
-                        msg.attach(part)
-                        
-                        logger.info(f"Attached file: {file_info['name']}")
+                    part = MIMEBase(maintype, subtype)
+                    part.set_payload(file_data)
+                    encoders.encode_base64(part)
+                    
+                    part.add_header(
+                        'Content-Disposition',
+                        f'attachment; filename= {file_info["name"]}'
+                    )
+                    msg.attach(part)
+                    
+                    logger.info(f"Attached file: {file_info['name']}")
         
         except Exception as e:
             logger.warning(f"Error processing file attachments: {str(e)}")
         
-        # Send email
+        # Send email over the pooled SMTP connection
         logger.info("Attempting to send notification email...")
-        with smtplib.SMTP_SSL(smtp_host, smtp_port) as server:
-            logger.info("SMTP connection established")
-            server.login(smtp_username, smtp_password)
-            logger.info("SMTP login successful")
-            
-            send_result = server.send_message(msg)
-            logger.info(f"SMTP send_message result: {send_result}")
-            
-            # Check if send_message returned any failed recipients
-            if send_result:
-                logger.warning(f"Some recipients failed: {send_result}")
-            else:
-                logger.info("All recipients accepted successfully")
-            
+        send_result = smtp_pool.send_message(smtp_host, smtp_port, smtp_username, smtp_password, msg)
+        logger.info(f"SMTP send_message result: {send_result}")
+        
+        # Check if send_message returned any failed recipients
+        if send_result:
+            logger.warning(f"Some recipients failed: {send_result}")
+        else:
+            logger.info("All recipients accepted successfully")
+        
         logger.info(f"Notification email sent successfully to admin")
         return True
         
     except Exception as e:
         logger.error(f"Error sending notification email: {str(e)}")
         return False
-    finally:
-        # Clean up downloaded temporary files
-        for temp_file_path in downloaded_files:
-            try:
-                os.unlink(temp_file_path)
-                logger.info(f"Cleaned up temporary file: {temp_file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temporary file {temp_file_path}: {str(e)}")
 
 if __name__ == "__main__":
     # Test with sample data
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+SMTP connection pool
+Keeps a logged-in SMTP_SSL connection per thread so consecutive emails skip the TLS handshake and login
+"""
+
+import atexit
+import smtplib
+import threading
+from email.message import Message
+from email.utils import getaddresses
+from typing import List, Tuple
+
+class SMTPPool:
+    """
+    Per-thread pool of SMTP_SSL connections.
+    A connection is reused while the server keeps it open and is transparently reopened once it drops.
+    """
+
+    # Errors that mean the cached connection went stale and a fresh one should be tried
+    RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionResetError, BrokenPipeError)
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _connect(self, host: str, port: int, username: str, password: str) -> smtplib.SMTP_SSL:
+        """Open and log in a new connection for the current thread"""
+        server = smtplib.SMTP_SSL(host, port)
+        server.login(username, password)
+        self._local.server = server
+        self._local.key = (host, port, username)
+        return server
+
+    def _get_connection(self, host: str, port: int, username: str, password: str) -> Tuple[smtplib.SMTP_SSL, bool]:
+        """
+        Get the current thread's connection, opening one if needed
+
+        Returns:
+            Tuple of (connection, whether it was reused)
+        """
+        server = getattr(self._local, 'server', None)
+        if server is not None and self._local.key == (host, port, username):
+            return server, True
+
+        self.close()
+        return self._connect(host, port, username, password), False
+
+    def sendmail(self, host: str, port: int, username: str, password: str,
+                 from_addr: str, to_addrs: List[str], message: bytes) -> dict:
+        """
+        Send an already serialized message, reconnecting once if the pooled connection dropped
+
+        Returns:
+            Dictionary of refused recipients as returned by smtplib.SMTP.sendmail
+        """
+        server, reused = self._get_connection(host, port, username, password)
+        try:
+            return server.sendmail(from_addr, to_addrs, message)
+        except self.RECONNECT_ERRORS:
+            self.close()
+            if not reused:
+                raise
+            server = self._connect(host, port, username, password)
+            return server.sendmail(from_addr, to_addrs, message)
+
+    def send_message(self, host: str, port: int, username: str, password: str, msg: Message) -> dict:
+        """
+        Send a message to every address in its To and Cc headers, as smtplib.SMTP.send_message does
+        
+        Returns:
+            Dictionary of refused recipients as returned by smtplib.SMTP.sendmail
+        """
+        from_addr = getaddresses(msg.get_all('From', []))[0][1]
+        to_addrs = [addr for _, addr in getaddresses(msg.get_all('To', []) + msg.get_all('Cc', []))]
+        
+        # Serialize with CRLF line endings, as send_message would
+        message = msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
+        return self.sendmail(host, port, username, password, from_addr, to_addrs, message)
+
+    def close(self):
+        """Close the current thread's connection if there is one"""
+        server = getattr(self._local, 'server', None)
+        self._local.server = None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                pass
+
+# Shared pool used by the email senders
+smtp_pool = SMTPPool()
+atexit.register(smtp_pool.close)
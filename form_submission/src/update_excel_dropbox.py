@@ -1,74 +1,171 @@
 import os
 import json
-import requests
-import pandas as pd
+import logging
 import sys
-from datetime import datetime, timedelta
+import time
+import threading
+import zipfile
+from xml.etree import ElementTree
+from functools import lru_cache
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-# SequenceMatcher removed - no longer needed
-from openpyxl import load_workbook
-from openpyxl.styles import Font
 
 # Import logging filter from root directory
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 from log_filter import setup_secure_logging
-from warranty_form_data import WarrantyFormData
+from warranty_form_data import WarrantyFormData, NOT_SPECIFIED
+from http_session import create_session
 
 load_dotenv()
 
 # Set up secure logging
 logger = setup_secure_logging('excel_dropbox')
 
+# Own session for the Dropbox calls: main.py runs the Excel update on a background
+# thread while the email senders use the shared session from their download threads
+session = create_session()
+
+# Files larger than this are uploaded in chunks of this size through an upload session
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Cached Dropbox access token and its expiry (time.monotonic() based)
+_TOKEN_CACHE = {'token': None, 'exp': 0}
+_TOKEN_LOCK = threading.Lock()
+
+# Namespace of the sheet entries in xl/workbook.xml
+SPREADSHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+# Workbooks saved and uploaded by this process per Dropbox path as (rev, workbook), reused instead of parsing again
+_WORKBOOK_CACHE = {}
+
+@lru_cache(maxsize=4)
+def _path_arg(file_path):
+    """JSON argument for Dropbox calls that only take a path, built once per path"""
+    return json.dumps({'path': file_path})
+
+@lru_cache(maxsize=4)
+def _upload_arg(file_path):
+    """JSON Dropbox-API-Arg for overwriting a file, built once per path"""
+    return json.dumps({
+        'path': file_path,
+        'mode': 'overwrite',
+        'autorename': False
+    })
+
 def get_dropbox_access_token():
-    """Get access token from refresh token"""
-    refresh_token = os.getenv('DROPBOX_REFRESH_TOKEN')
-    app_key = os.getenv('DROPBOX_APP_KEY')
-    app_secret = os.getenv('DROPBOX_APP_SECRET')
-    
-    url = 'https://api.dropbox.com/oauth2/token'
-    data = {
-        'grant_type': 'refresh_token',
-        'refresh_token': refresh_token,
-        'client_id': app_key,
-        'client_secret': app_secret
+    """Get access token from refresh token, reusing the cached one until it is about to expire"""
+    with _TOKEN_LOCK:
+        # Keep a 60 second margin so a token never expires mid-request
+        if _TOKEN_CACHE['token'] and time.monotonic() < _TOKEN_CACHE['exp'] - 60:
+            return _TOKEN_CACHE['token']
+        
+        refresh_token = os.getenv('DROPBOX_REFRESH_TOKEN')
+        app_key = os.getenv('DROPBOX_APP_KEY')
+        app_secret = os.getenv('DROPBOX_APP_SECRET')
+        
+        url = 'https://api.dropbox.com/oauth2/token'
+        data = {
+            'grant_type': 'refresh_token',
+            'refresh_token': refresh_token,
+            'client_id': app_key,
+            'client_secret': app_secret
+        }
+        
+        response = session.post(url, data=data)
+        if response.status_code == 200:
+            token_data = response.json()
+            _TOKEN_CACHE['token'] = token_data['access_token']
+            _TOKEN_CACHE['exp'] = time.monotonic() + token_data.get('expires_in', 14400)
+            return _TOKEN_CACHE['token']
+        else:
+            raise Exception(f"Failed to get access token: {response.text}")
+
+def get_dropbox_file_rev(access_token, file_path):
+    """Get the current revision of a Dropbox file from its metadata"""
+    url = 'https://api.dropboxapi.com/2/files/get_metadata'
+    headers = {
+        'Authorization': f'Bearer {access_token}',
+        'Content-Type': 'application/json'
     }
     
-    response = requests.post(url, data=data)
+    response = session.post(url, headers=headers, data=_path_arg(file_path))
     if response.status_code == 200:
-        return response.json()['access_token']
+        return response.json().get('rev')
     else:
-        raise Exception(f"Failed to get access token: {response.text}")
+        raise Exception(f"Failed to get file metadata: {response.text}")
 
 def download_excel_from_dropbox(access_token, file_path):
     """Download Excel file from Dropbox"""
     url = 'https://content.dropboxapi.com/2/files/download'
     headers = {
         'Authorization': f'Bearer {access_token}',
-        'Dropbox-API-Arg': json.dumps({'path': file_path})
+        'Dropbox-API-Arg': _path_arg(file_path)
     }
     
-    response = requests.post(url, headers=headers)
+    response = session.post(url, headers=headers)
     if response.status_code == 200:
         return BytesIO(response.content)
     else:
         raise Exception(f"Failed to download file: {response.text}")
 
+def _upload_session_request(access_token, endpoint, api_arg, chunk):
+    """Send one upload_session request (start, append_v2 or finish) to Dropbox"""
+    url = f'https://content.dropboxapi.com/2/files/upload_session/{endpoint}'
+    headers = {
+        'Authorization': f'Bearer {access_token}',
+        'Dropbox-API-Arg': json.dumps(api_arg),
+        'Content-Type': 'application/octet-stream'
+    }
+    
+    response = session.post(url, headers=headers, data=chunk)
+    if response.status_code == 200:
+        return response.json() if response.content else {}
+    else:
+        raise Exception(f"Failed to upload file ({endpoint}): {response.text}")
+
+def _upload_large(access_token, file_path, fileobj, size):
+    """Upload a large file to Dropbox in chunks using an upload session"""
+    chunk = fileobj.read(UPLOAD_CHUNK_SIZE)
+    session_id = _upload_session_request(access_token, 'start', {'close': False}, chunk)['session_id']
+    offset = len(chunk)
+    
+    # Keep the last chunk for the finish call
+    while size - offset > UPLOAD_CHUNK_SIZE:
+        chunk = fileobj.read(UPLOAD_CHUNK_SIZE)
+        cursor = {'session_id': session_id, 'offset': offset}
+        _upload_session_request(access_token, 'append_v2', {'cursor': cursor, 'close': False}, chunk)
+        offset += len(chunk)
+    
+    cursor = {'session_id': session_id, 'offset': offset}
+    commit = {'path': file_path, 'mode': 'overwrite', 'autorename': False}
+    return _upload_session_request(access_token, 'finish', {'cursor': cursor, 'commit': commit}, fileobj.read())
+
 def upload_excel_to_dropbox(access_token, file_path, excel_data):
-    """Upload Excel file to Dropbox"""
+    """Upload Excel file to Dropbox, streaming from a file-like object or bytes"""
+    if isinstance(excel_data, (bytes, bytearray)):
+        excel_data = BytesIO(excel_data)
+    
+    # Measure the payload without copying it
+    excel_data.seek(0, 2)
+    size = excel_data.tell()
+    excel_data.seek(0)
+    
+    if size > UPLOAD_CHUNK_SIZE:
+        logger.info(f"Uploading {size} bytes in chunks using an upload session")
+        return _upload_large(access_token, file_path, excel_data, size)
+    
     url = 'https://content.dropboxapi.com/2/files/upload'
     headers = {
         'Authorization': f'Bearer {access_token}',
-        'Dropbox-API-Arg': json.dumps({
-            'path': file_path,
-            'mode': 'overwrite',
-            'autorename': False
-        }),
+        'Dropbox-API-Arg': _upload_arg(file_path),
         'Content-Type': 'application/octet-stream'
     }
     
-    response = requests.post(url, headers=headers, data=excel_data)
+    response = session.post(url, headers=headers, data=excel_data)
     if response.status_code == 200:
         return response.json()
     else:
@@ -80,18 +177,77 @@ def upload_excel_to_dropbox(access_token, file_path, excel_data):
 
 # Remove the old prepare_row_data function since we now use WarrantyFormData.to_excel_row()
 
-def find_column_index(worksheet, column_name):
-    """Find the column index for a given column name in the header row"""
-    for col_idx, cell in enumerate(worksheet[1], 1):
-        if cell.value == column_name:
-            return col_idx
+def extend_data_validation_range(worksheet, column_index, inserted_row):
+    """
+    Extend the data validation ranges of a column over a row inserted with insert_rows()
+    
+    insert_rows() shifts the cell values down but leaves the data validation ranges where they were,
+    so the bottom row would drop out of the dropdown on every insert. The matching ranges are edited
+    in place on their existing DataValidation.
+    
+    Returns:
+        Number of ranges that were extended or shifted
+    """
+    adjusted = 0
+    for dv in worksheet.data_validations.dataValidation:
+        for cell_range in list(dv.sqref.ranges):
+            if not cell_range.min_col <= column_index <= cell_range.max_col or cell_range.max_row < inserted_row:
+                continue
+            
+            # Ranges are hashed by their bounds, so take the range out while it changes
+            dv.sqref.remove(cell_range)
+            if cell_range.min_row <= inserted_row:
+                # The range covers the insert point: grow it over the inserted row
+                cell_range.expand(down=1)
+            else:
+                # The range is entirely below the insert point: move it with its rows
+                cell_range.shift(row_shift=1)
+            dv.sqref.add(cell_range)
+            adjusted += 1
+    
+    return adjusted
+
+def get_sheet_names(excel_file):
+    """Read the sheet names from xl/workbook.xml without parsing the whole workbook"""
+    with zipfile.ZipFile(excel_file) as archive:
+        root = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    excel_file.seek(0)
+    return [sheet.get('name') for sheet in root.iter(f'{SPREADSHEET_NS}sheet')]
+
+def get_cached_workbook(access_token, file_path):
+    """
+    Get the workbook this process last uploaded to file_path if Dropbox still has that revision
+    
+    The entry is removed from the cache, so a failed edit cannot leave a modified workbook behind
+    """
+    cached = _WORKBOOK_CACHE.pop(file_path, None)
+    if not cached:
+        return None
+    
+    try:
+        if get_dropbox_file_rev(access_token, file_path) == cached[0]:
+            logger.info(f"Reusing workbook uploaded by this process (rev {cached[0]})")
+            return cached[1]
+    except Exception as e:
+        logger.warning(f"Could not check file revision, loading workbook again: {str(e)}")
     return None
 
-# Removed find_first_empty_row_within_validation and extend_data_validation_range functions
-# since we now use worksheet.insert_rows() which automatically handles data validation ranges
+def cache_uploaded_workbook(file_path, upload_result, workbook):
+    """Remember a saved workbook under the revision Dropbox assigned to the upload"""
+    rev = upload_result.get('rev')
+    if rev:
+        _WORKBOOK_CACHE[file_path] = (rev, workbook)
+
+def get_column_headers(worksheet):
+    """Map header names in the first row to their 1-based column index"""
+    header_row = next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    return {name: col_idx for col_idx, name in enumerate(header_row, 1) if name}
 
 def update_ticket_status(ticket_id: str, brand: str, new_status: str):
     """Update the status of an existing ticket in the Excel file"""
+    # openpyxl is imported on first use to keep module import cheap
+    from openpyxl import load_workbook
+    
     try:
         logger.info(f"Updating status for ticket {ticket_id} in {brand} sheet to '{new_status}'")
         
@@ -100,24 +256,27 @@ def update_ticket_status(ticket_id: str, brand: str, new_status: str):
         folder_path = os.getenv('DROPBOX_FOLDER_PATH')
         file_path = f"{folder_path}/GARANTIAS_PROFFECTIV.xlsx"
         
-        # Download existing Excel file
-        excel_file = download_excel_from_dropbox(access_token, file_path)
+        # Reuse the workbook saved by update_excel_file in this run instead of downloading and parsing it again
+        workbook = get_cached_workbook(access_token, file_path)
         
-        # Load workbook with openpyxl
-        workbook = load_workbook(excel_file, data_only=False)
-        
-        # Check if brand sheet exists
-        if brand not in workbook.sheetnames:
+        if workbook is None:
+            # Download existing Excel file
+            excel_file = download_excel_from_dropbox(access_token, file_path)
+            
+            # Check if brand sheet exists before paying for the full parse
+            if brand not in get_sheet_names(excel_file):
+                raise Exception(f"Sheet '{brand}' not found in Excel file")
+            
+            # Load workbook with openpyxl
+            workbook = load_workbook(excel_file, data_only=False)
+        elif brand not in workbook.sheetnames:
             raise Exception(f"Sheet '{brand}' not found in Excel file")
         
         # Get the specific brand worksheet
         worksheet = workbook[brand]
         
         # Get column headers
-        headers = {}
-        for col_idx, cell in enumerate(worksheet[1], 1):
-            if cell.value:
-                headers[cell.value] = col_idx
+        headers = get_column_headers(worksheet)
         
         # Find Ticket ID and Estado columns
         ticket_id_col = headers.get('Ticket ID')
@@ -128,12 +287,13 @@ def update_ticket_status(ticket_id: str, brand: str, new_status: str):
         
         # Find the row with the matching ticket ID
         updated = False
-        for row in range(2, worksheet.max_row + 1):
-            current_ticket_id = worksheet.cell(row=row, column=ticket_id_col).value
+        ticket_id_values = worksheet.iter_rows(min_row=2, min_col=ticket_id_col, max_col=ticket_id_col, values_only=True)
+        for row, (current_ticket_id,) in enumerate(ticket_id_values, start=2):
             if current_ticket_id and str(current_ticket_id).strip() == ticket_id:
                 # Update the status
-                old_status = worksheet.cell(row=row, column=estado_col).value
-                worksheet.cell(row=row, column=estado_col).value = new_status
+                estado_cell = worksheet.cell(row=row, column=estado_col)
+                old_status = estado_cell.value
+                estado_cell.value = new_status
                 logger.info(f"Updated ticket {ticket_id} status from '{old_status}' to '{new_status}' at row {row}")
                 updated = True
                 break
@@ -147,7 +307,8 @@ def update_ticket_status(ticket_id: str, brand: str, new_status: str):
         output.seek(0)
         
         # Upload updated file back to Dropbox
-        upload_excel_to_dropbox(access_token, file_path, output.getvalue())
+        upload_result = upload_excel_to_dropbox(access_token, file_path, output)
+        cache_uploaded_workbook(file_path, upload_result, workbook)
         
         logger.info(f"Successfully updated status for ticket {ticket_id} to '{new_status}'")
         return True
@@ -158,149 +319,129 @@ def update_ticket_status(ticket_id: str, brand: str, new_status: str):
 
 def update_excel_file(form_data: WarrantyFormData):
     """Main function to update Excel file in Dropbox using WarrantyFormData object with openpyxl to preserve formatting"""
+    # openpyxl is imported on first use to keep module import cheap
+    from openpyxl import load_workbook
+    from openpyxl.styles import Font
+    
     try:
         brand = form_data.brand
         
-        if not brand or brand == 'No especificado':
+        if not brand or brand == NOT_SPECIFIED:
             raise Exception("Brand not found in form data")
         
-        logger.info(f"Processing Excel update for brand: {brand}")
-        logger.info(f"Form data ticket ID: {form_data.ticket_id}")
+        logger.info("Processing Excel update for brand %s, ticket %s", brand, form_data.ticket_id)
         
-        # Get Dropbox credentials
-        access_token = get_dropbox_access_token()
         folder_path = os.getenv('DROPBOX_FOLDER_PATH')
         file_path = f"{folder_path}/GARANTIAS_PROFFECTIV.xlsx"
         
-        logger.info(f"Downloading Excel file from: {file_path}")
-        
-        # Download existing Excel file
-        excel_file = download_excel_from_dropbox(access_token, file_path)
+        logger.debug("Downloading Excel file from: %s", file_path)
         
-        # Load workbook with openpyxl to preserve formatting and data validation
-        workbook = load_workbook(excel_file, data_only=False)
+        # Get Dropbox credentials and download the existing Excel file in the background
+        # while the new row is prepared; the single worker runs them in order
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            token_future = executor.submit(get_dropbox_access_token)
+            download_future = executor.submit(lambda: download_excel_from_dropbox(token_future.result(), file_path))
+            
+            # Prepare new row data using form_data
+            new_row_data = form_data.to_excel_row(brand)
+            
+            access_token = token_future.result()
+            excel_file = download_future.result()
         
-        logger.info(f"Available sheets in workbook: {workbook.sheetnames}")
+        sheet_names = get_sheet_names(excel_file)
+        logger.debug("Available sheets in workbook: %s", sheet_names)
         
-        # Check if brand sheet exists
-        if brand not in workbook.sheetnames:
+        # Check if brand sheet exists before paying for the full parse
+        if brand not in sheet_names:
             raise Exception(f"Sheet '{brand}' not found in Excel file")
         
+        # Load workbook with openpyxl to preserve formatting and data validation
+        workbook = load_workbook(excel_file, data_only=False)
+        
         # Get the specific brand worksheet
         worksheet = workbook[brand]
         
         # Get column headers from first row to map data correctly
-        headers = {}
-        for col_idx, cell in enumerate(worksheet[1], 1):
-            if cell.value:
-                headers[cell.value] = col_idx
-        
-        logger.info(f"Excel headers found: {list(headers.keys())}")
+        headers = get_column_headers(worksheet)
         
-        # Find all rows with ticket ID data to understand the data structure
-        ticket_id_col = headers.get('Ticket ID', 1)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Excel headers found: {list(headers.keys())}")
         
         # NEW APPROACH: Always insert at row 2 (after headers) and shift existing data down
         insert_row = 2
-        logger.info(f"Will insert new row at position {insert_row} (after headers)")
         
-        # Find the last row with actual data to know how many rows to shift
-        data_rows = []
-        scan_range = min(worksheet.max_row + 1, 2000)  # Limit scan to prevent performance issues
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Existing data up to row {worksheet.max_row}")
         
-        for row in range(2, scan_range):
-            ticket_id = worksheet.cell(row=row, column=ticket_id_col).value
-            if ticket_id and str(ticket_id).strip():
-                data_rows.append(row)
-        
-        if data_rows:
-            actual_last_row = max(data_rows)
-            logger.info(f"Found existing data up to row {actual_last_row}. Will shift existing data down by 1 row.")
-            
-            # Insert a new row at position 2, which automatically shifts existing data down
-            worksheet.insert_rows(insert_row, 1)
-            logger.info(f"Inserted new row at position {insert_row}")
-        else:
-            logger.info("No existing data found, will add first data row at position 2")
+        # Insert a new row at position 2, which shifts the existing cell values down
+        worksheet.insert_rows(insert_row, 1)
+        logger.debug("Inserted new row at position %s", insert_row)
         
         # The row to write to is always row 2 after insertion
         next_row = insert_row
         
-        # Prepare new row data using form_data
-        new_row_data = form_data.to_excel_row(brand)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"New row data keys: {list(new_row_data.keys())}")
+            logger.debug(f"New row data values: {list(new_row_data.values())}")
         
-        logger.info(f"New row data keys: {list(new_row_data.keys())}")
-        logger.info(f"New row data values: {list(new_row_data.values())}")
+        # Resolve the target column of every value once, before touching the worksheet
+        estado_col_idx = headers.get('Estado')
+        row_cells = [(headers[column_name], column_name, value)
+                     for column_name, value in new_row_data.items() if column_name in headers]
+        for column_name in [name for name in new_row_data if name not in headers]:
+            logger.warning(f"Column '{column_name}' not found in Excel headers")
         
         # Write new row data to worksheet
-        cells_written = 0
-        estado_col_idx = None
-        for column_name, value in new_row_data.items():
-            if column_name in headers:
-                col_idx = headers[column_name]
-                cell = worksheet.cell(row=next_row, column=col_idx)
-                old_value = cell.value
-                
-                # Handle hyperlink formatting for URL fields
-                if isinstance(value, dict) and value.get('type') == 'hyperlink':
-                    cell.value = value['text']
-                    cell.hyperlink = value['url']
-                    cell.font = Font(color="0000FF", underline="single")  # Blue underlined text
-                    logger.info(f"Writing hyperlink to cell {cell.coordinate}: '{value['text']}' -> '{value['url']}'")
-                else:
-                    cell.value = value
-                    logger.info(f"Writing to cell {cell.coordinate} (row {next_row}, col {col_idx}): '{column_name}' = '{value}' (was: '{old_value}')")
-                
-                cells_written += 1
-                
-                # Remember Estado column for validation extension
-                if column_name == 'Estado':
-                    estado_col_idx = col_idx
-                
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for col_idx, column_name, value in row_cells:
+            cell = worksheet.cell(row=next_row, column=col_idx)
+            
+            # Handle hyperlink formatting for URL fields
+            if isinstance(value, dict) and value.get('type') == 'hyperlink':
+                cell.value = value['text']
+                cell.hyperlink = value['url']
+                cell.font = Font(color="0000FF", underline="single")  # Blue underlined text
+                if debug_enabled:
+                    logger.debug("Writing hyperlink to cell %s: '%s' -> '%s'", cell.coordinate, value['text'], value['url'])
             else:
-                logger.warning(f"Column '{column_name}' not found in Excel headers")
+                if debug_enabled:
+                    logger.debug("Writing to cell %s (row %s, col %s): '%s' = '%s' (was: '%s')",
+                                 cell.coordinate, next_row, col_idx, column_name, value, cell.value)
+                cell.value = value
         
-        # After writing all data, extend data validation for Estado column if needed
-        # Since we inserted a row, the data validation ranges are automatically extended by openpyxl
-        # but we may need to verify and adjust if necessary
-        if estado_col_idx:
-            logger.info(f"Data validation should be automatically extended due to row insertion at {next_row}")
-            # The extend_data_validation_range function is no longer needed since insert_rows handles this
-            # extend_data_validation_range(worksheet, estado_col_idx, next_row)
-        
-        logger.info(f"Total cells written: {cells_written}")
+        cells_written = len(row_cells)
         
-        # Verify the data was written by checking a few key cells
-        verification_cells = ['Ticket ID', 'Estado', 'Empresa']
-        for col_name in verification_cells:
-            if col_name in headers:
-                col_idx = headers[col_name]
-                cell_value = worksheet.cell(row=next_row, column=col_idx).value
-                logger.info(f"Verification - {col_name}: '{cell_value}'")
+        # insert_rows() does not move data validation ranges, so extend the Estado dropdown over the new row
+        if estado_col_idx:
+            adjusted = extend_data_validation_range(worksheet, estado_col_idx, next_row)
+            logger.debug("Adjusted %s data validation ranges for the Estado column", adjusted)
         
-        # Check new max row after writing
-        new_max_row = worksheet.max_row
-        logger.info(f"New max row after writing: {new_max_row} (should be {next_row})")
+        # Log a few key values written, taken from the row data instead of reading the cells back
+        if debug_enabled:
+            for col_name in ('Ticket ID', 'Estado', 'Empresa'):
+                if col_name in headers:
+                    logger.debug("Written - %s: '%s'", col_name, new_row_data.get(col_name))
         
         # Save workbook to BytesIO
-        logger.info("Saving workbook to BytesIO...")
+        logger.debug("Saving workbook to BytesIO...")
         output = BytesIO()
         workbook.save(output)
         output.seek(0)
         
-        # Get size of saved data
-        saved_size = len(output.getvalue())
-        logger.info(f"Saved Excel file size: {saved_size} bytes")
+        # Get size of saved data from a zero-copy view of the buffer
+        saved_size = output.getbuffer().nbytes
+        logger.debug("Saved Excel file size: %s bytes", saved_size)
         
         if saved_size == 0:
             raise Exception("Saved Excel file is empty!")
         
         # Upload updated file back to Dropbox
-        logger.info("Uploading file to Dropbox...")
-        upload_result = upload_excel_to_dropbox(access_token, file_path, output.getvalue())
+        logger.debug("Uploading file to Dropbox...")
+        upload_result = upload_excel_to_dropbox(access_token, file_path, output)
+        cache_uploaded_workbook(file_path, upload_result, workbook)
         
-        logger.info(f"Excel file updated successfully. New row added to {brand} sheet.")
-        logger.info(f"File uploaded to Dropbox: {upload_result.get('path_display', file_path)}")
+        logger.info("Excel file updated successfully: ticket %s written to %s sheet row %s (%s cells), uploaded to %s",
+                    form_data.ticket_id, brand, next_row, cells_written, upload_result.get('path_display', file_path))
         
         return True
         
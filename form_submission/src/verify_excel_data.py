@@ -40,8 +40,8 @@ def verify_excel_data(brand="Conway", last_n_rows=10):
         # Download existing Excel file
         excel_file = download_excel_from_dropbox(access_token, file_path)
         
-        # Load workbook with openpyxl
-        workbook = load_workbook(excel_file, data_only=True)  # data_only=True to get calculated values
+        # Load workbook with openpyxl in read-only mode, only values are needed
+        workbook = load_workbook(excel_file, read_only=True, data_only=True)  # data_only=True to get calculated values
         
         logger.info(f"Available sheets: {workbook.sheetnames}")
         
@@ -52,21 +52,24 @@ def verify_excel_data(brand="Conway", last_n_rows=10):
         # Get the specific brand worksheet
         worksheet = workbook[brand]
         
-        # Get headers
-        headers = []
-        for col_idx, cell in enumerate(worksheet[1], 1):
-            if cell.value:
-                headers.append(cell.value)
+        # Stream the sheet once as plain values; the first row holds the headers
+        rows = worksheet.iter_rows(values_only=True)
+        headers = [value for value in next(rows, ()) if value]
         
         logger.info(f"Headers in {brand} sheet: {headers}")
         logger.info(f"Total max row: {worksheet.max_row}")
         
-        # Find actual last row with data
+        # Keep the data rows limited to the header columns; read-only rows stop at their last cell, so pad them
+        width = max(len(headers), 1)
+        data_rows = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+        workbook.close()
+        
+        # Find actual last row with data, searching back from the end
         actual_last_row = 1
-        for row in range(2, worksheet.max_row + 1):
-            ticket_id_cell = worksheet.cell(row=row, column=1)  # Assuming Ticket ID is in column A
-            if ticket_id_cell.value is not None:
-                actual_last_row = row
+        for index in range(len(data_rows) - 1, -1, -1):
+            if data_rows[index][0] is not None:  # Assuming Ticket ID is in column A
+                actual_last_row = index + 2
+                break
         
         logger.info(f"Actual last row with data: {actual_last_row}")
         
@@ -75,10 +78,7 @@ def verify_excel_data(brand="Conway", last_n_rows=10):
         logger.info(f"Showing rows {start_row} to {actual_last_row}:")
         
         for row in range(start_row, actual_last_row + 1):
-            row_data = []
-            for col in range(1, len(headers) + 1):
-                cell_value = worksheet.cell(row=row, column=col).value
-                row_data.append(str(cell_value) if cell_value is not None else "")
+            row_data = [str(value) if value is not None else "" for value in data_rows[row - 2]]
             
             # Show first few columns to verify data exists
             ticket_id = row_data[0] if len(row_data) > 0 else ""
@@ -7,16 +7,23 @@ Centralized webhook data parsing and normalization for warranty form processing
 import sys
 import os
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from functools import cached_property
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 # Import logging filter from root directory
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 from log_filter import setup_secure_logging
 
 # Set up secure logging
 logger = setup_secure_logging('warranty_form_data')
 
+# Placeholder values for fields that were left empty or do not apply to the brand
+NOT_SPECIFIED = 'No especificado'
+NOT_APPLICABLE = 'No aplicable'
+
 @dataclass
 class FileInfo:
     """Represents a file attachment"""
@@ -26,10 +33,125 @@ class FileInfo:
     mime_type: str = ""
     size: int = 0
 
+# Form field name and fallback names per brand for fields whose label differs between brand forms
+BRAND_FIELD_NAMES = {
+    'conway': {
+        # Conway uses text input for model
+        'modelo': ('Conway - Modelo', ['Conway - Por favor, indica el nombre completo del modelo (ej. Cairon C 2.0 500)']),
+        'talla': ('Talla', ['Conway - Talla']),
+        'año': ('Año de fabricación', ['Conway - Año de fabricación']),
+        'estado': ('Estado del producto', ['Conway - Estado de la bicicleta']),
+        'solucion': (
+            'Solución o reparación propuesta y presupuesto',
+            ['Solución o reparación propuesta y presupuesto aproximado', 'Conway - Solución o reparación propuesta y presupuesto aproximado']
+        ),
+        'factura_compra': ('Factura de compra', ['Conway - Adjunta la factura de compra a Hartje']),
+        'factura_venta': ('Factura de venta', ['Conway - Adjunta la factura de venta']),
+    },
+    'cycplus': {
+        # Cycplus uses unified dropdown or brand-specific
+        'modelo': ('Modelo', ['Cycplus - Modelo']),
+        'estado': ('Estado del producto', ['Cycplus - Estado del Producto']),
+        'factura_compra': ('Factura de compra', ['Adjunta la factura de compra']),
+        'factura_venta': ('Factura de venta', ['Cycplus - Adjunta la factura de venta']),
+    },
+    'dare': {
+        # Dare uses unified dropdown or brand-specific
+        'modelo': ('Modelo', ['Dare - Modelo']),
+        'talla': ('Talla', ['Dare - Talla']),
+        'año': ('Año de fabricación', ['Dare - Año de fabricación']),
+        'estado': ('Estado del producto', ['Dare - Estado de la bicicleta']),
+        'solucion': (
+            'Solución o reparación propuesta y presupuesto',
+            ['Solución o reparación propuesta y presupuesto aproximado', 'Dare - Solución o reparación propuesta y presupuesto aproximado']
+        ),
+        'factura_compra': ('Factura de compra', ['Dare - Adjunta la factura de compra']),
+        'factura_venta': ('Factura de venta', ['Dare - Adjunta la factura de venta']),
+    },
+    'kogel': {
+        'modelo': ('Kogel - Modelo', ['Modelo']),
+    },
+}
+
+# Field names for brands without their own entry; talla and solucion do not apply to them
+DEFAULT_FIELD_NAMES = {
+    'modelo': ('Modelo', None),
+    'año': ('Año de fabricación', None),
+    'estado': ('Estado del producto', None),
+    'factura_compra': ('Factura de compra', None),
+    'factura_venta': ('Factura de venta', None),
+}
+
+# Columns written to each brand sheet, in sheet order; any other brand gets the generic columns
+EXCEL_ROW_COLUMNS = {
+    'Conway': (
+        'Ticket ID', 'Estado', 'Fecha de creación', 'Empresa', 'NIF/CIF/VAT', 'Email', 'Modelo', 'Talla',
+        'Año de fabricación', 'Estado de la bicicleta', 'Descripción del problema',
+        'Solución y/o reparación propuesta y presupuesto',
+        'Factura de compra', 'Factura de venta', 'Imágenes', 'Vídeos'
+    ),
+    'Cycplus': (
+        'Ticket ID', 'Estado', 'Fecha de creación', 'Empresa', 'NIF/CIF/VAT', 'Email', 'Modelo',
+        'Estado del producto', 'Descripción del problema',
+        'Solución y/o reparación propuesta y presupuesto',
+        'Factura de compra', 'Factura de venta', 'Imágenes', 'Vídeos'
+    ),
+    'Dare': (
+        'Ticket ID', 'Estado', 'Fecha de creación', 'Empresa', 'NIF/CIF/VAT', 'Email', 'Modelo', 'Talla',
+        'Estado de la bicicleta', 'Descripción del problema',
+        'Solución y/o reparación propuesta y presupuesto',
+        'Factura de compra', 'Factura de venta', 'Imágenes', 'Vídeos'
+    ),
+    'Kogel': (
+        'Ticket ID', 'Estado', 'Fecha de creación', 'Empresa', 'NIF/CIF/VAT', 'Email', 'Modelo',
+        'Estado del producto', 'Descripción del problema',
+        'Solución y/o reparación propuesta y presupuesto',
+        'Factura de compra', 'Factura de venta', 'Imágenes', 'Vídeos'
+    ),
+}
+GENERIC_EXCEL_ROW_COLUMNS = (
+    'Ticket ID', 'Estado', 'Fecha de creación', 'Empresa', 'NIF/CIF/VAT', 'Email', 'Modelo',
+    'Descripción del problema'
+)
+
+# Columns a brand sheet always fills with a fixed value, whatever the form contains
+EXCEL_FIXED_VALUES = {
+    'Cycplus': {'Solución y/o reparación propuesta y presupuesto': NOT_APPLICABLE},
+    'Kogel': {'Solución y/o reparación propuesta y presupuesto': NOT_APPLICABLE},
+}
+
+def excel_hyperlink(files: Tuple[FileInfo, ...]) -> Any:
+    """Excel cell value linking to the first file, or an empty cell if there are no files"""
+    if not files:
+        return ''
+    return {'type': 'hyperlink', 'url': files[0].url, 'text': files[0].name}
+
+# How each Excel column is filled from a WarrantyFormData
+EXCEL_COLUMN_VALUES = {
+    'Ticket ID': lambda form: form.ticket_id,
+    'Estado': lambda form: 'Recibida',
+    'Fecha de creación': lambda form: form.fecha_creacion_excel,
+    'Empresa': lambda form: form.empresa,
+    'NIF/CIF/VAT': lambda form: form.nif_cif,
+    'Email': lambda form: form.email,
+    'Modelo': lambda form: form.modelo,
+    'Talla': lambda form: form.talla,
+    'Año de fabricación': lambda form: form.año,
+    'Estado de la bicicleta': lambda form: form.estado,
+    'Estado del producto': lambda form: form.estado,
+    'Descripción del problema': lambda form: form.problema,
+    'Solución y/o reparación propuesta y presupuesto': lambda form: form.solucion,
+    'Factura de compra': lambda form: excel_hyperlink(form.factura_compra),
+    'Factura de venta': lambda form: excel_hyperlink(form.factura_venta),
+    'Imágenes': lambda form: excel_hyperlink(form.fotos_problema),
+    'Vídeos': lambda form: excel_hyperlink(form.videos_problema)
+}
+
 class WarrantyFormData:
     """
     Centralized class for parsing and normalizing warranty form webhook data.
     Handles multiple webhook formats (old structure, new unified structure, GitHub Actions format).
+    Field properties are resolved on first access and cached, since the parsed fields never change.
     """
     
     def __init__(self, webhook_data: Dict[str, Any], ticket_id: str = ""):
@@ -43,33 +165,42 @@ class WarrantyFormData:
         self.raw_data = webhook_data
         self.ticket_id = ticket_id
         self._fields = {}
+        
+        # Creation moment formatted once, so the Excel row and the emails show the same time
+        created_at = datetime.now()
+        self._fecha_creacion = created_at.strftime('%d/%m/%Y %H:%M')
+        self._fecha_creacion_excel = created_at.strftime('%d/%m/%Y')
+        
         self._parse_webhook_data()
         
     def _parse_webhook_data(self):
         """Parse webhook data and extract fields based on format"""
         try:
+            raw_data = self.raw_data
+            
             # Determine webhook format and extract fields
-            if 'fields' in self.raw_data and 'fieldsById' in self.raw_data:
+            if 'fields' in raw_data and 'fieldsById' in raw_data:
                 # New GitHub action webhook structure (direct client_payload)
-                self._fields = self.raw_data['fields']
+                self._fields = raw_data['fields']
                 logger.info("Detected new GitHub action webhook structure")
                 
-            elif 'client_payload' in self.raw_data:
+            elif 'client_payload' in raw_data:
                 # GitHub webhook structure with client_payload
-                if 'fields' in self.raw_data['client_payload']:
-                    self._fields = self.raw_data['client_payload']['fields']
+                client_payload = raw_data['client_payload']
+                if 'fields' in client_payload:
+                    self._fields = client_payload['fields']
                     logger.info("Detected GitHub webhook structure with client_payload")
                 else:
                     # Old structure within client_payload
-                    self._parse_old_structure(self.raw_data['client_payload'])
+                    self._parse_old_structure(client_payload)
                     
-            elif 'data' in self.raw_data and 'fields' in self.raw_data['data']:
+            elif 'data' in raw_data and 'fields' in raw_data['data']:
                 # Old webhook structure with data.fields
-                self._parse_old_structure(self.raw_data['data'])
+                self._parse_old_structure(raw_data['data'])
                 
             else:
                 # Try parsing as direct old structure
-                self._parse_old_structure(self.raw_data)
+                self._parse_old_structure(raw_data)
                 
         except Exception as e:
             logger.error(f"Error parsing webhook data: {str(e)}")
@@ -87,16 +218,21 @@ class WarrantyFormData:
                 
                 # Handle dropdown options - convert IDs to text values
                 if isinstance(value, list) and field.get('options'):
+                    # Map option ids and texts to their option once; the first matching option wins.
+                    # Only string values are looked up, so only string keys are indexed.
+                    options_by_key = {}
+                    for option in field['options']:
+                        if not isinstance(option, dict):
+                            continue
+                        for key in (option.get('id'), option.get('text')):
+                            if isinstance(key, str):
+                                options_by_key.setdefault(key, option)
+                    
                     converted_values = []
                     for val in value:
                         if isinstance(val, str):
-                            # Find matching option text
-                            for option in field.get('options', []):
-                                if option.get('id') == val or option.get('text') == val:
-                                    converted_values.append(option.get('text', val))
-                                    break
-                            else:
-                                converted_values.append(val)
+                            option = options_by_key.get(val)
+                            converted_values.append(val if option is None else option.get('text', val))
                     self._fields[label] = converted_values
                 else:
                     self._fields[label] = value
@@ -107,6 +243,23 @@ class WarrantyFormData:
             logger.error(f"Error parsing old structure: {str(e)}")
             self._fields = {}
     
+    def _lookup_field(self, field_name: str, fallback_names: List[str] = None) -> Any:
+        """
+        Get the raw value of a field, trying the fallback names if the primary name is missing
+        
+        Args:
+            field_name: Primary field name to look for
+            fallback_names: List of fallback field names for backward compatibility
+            
+        Returns:
+            Raw field value or None if none of the names is present
+        """
+        fields = self._fields
+        value = fields.get(field_name)
+        if value is None and fallback_names:
+            value = next((fields[name] for name in fallback_names if fields.get(name) is not None), None)
+        return value
+    
     def _get_field_value(self, field_name: str, fallback_names: List[str] = None) -> str:
         """
         Get field value with fallback support for backward compatibility
@@ -118,21 +271,16 @@ class WarrantyFormData:
         Returns:
             Field value as string or 'No especificado' if not found
         """
-        # Try primary field name first
-        value = self._fields.get(field_name)
-        
-        # Try fallback names if primary not found
-        if value is None and fallback_names:
-            for fallback in fallback_names:
-                value = self._fields.get(fallback)
-                if value is not None:
-                    break
+        value = self._lookup_field(field_name, fallback_names)
         
         if value is None:
-            return 'No especificado'
+            return NOT_SPECIFIED
         
-        # Handle different value types
-        if isinstance(value, list):
+        # Handle different value types, most common (plain text) first.
+        # isspace() checks for a blank answer without building a stripped copy.
+        if isinstance(value, str):
+            return value if value and not value.isspace() else NOT_SPECIFIED
+        elif isinstance(value, list):
             if len(value) > 0:
                 if isinstance(value[0], dict):
                     # File upload - return file info
@@ -141,13 +289,11 @@ class WarrantyFormData:
                     # Dropdown selection - return the selected value
                     return str(value[0])
             else:
-                return 'No especificado'
-        elif isinstance(value, str):
-            return value if value.strip() else 'No especificado'
+                return NOT_SPECIFIED
         else:
-            return str(value) if value else 'No especificado'
+            return str(value) if value else NOT_SPECIFIED
     
-    def _get_file_list(self, field_name: str, fallback_names: List[str] = None) -> List[FileInfo]:
+    def _get_file_list(self, field_name: str, fallback_names: List[str] = None) -> Tuple[FileInfo, ...]:
         """
         Get list of files from a field
         
@@ -156,111 +302,82 @@ class WarrantyFormData:
             fallback_names: List of fallback field names
             
         Returns:
-            List of FileInfo objects
+            Tuple of FileInfo objects, shared by every caller of the cached property
         """
-        # Try primary field name first
-        value = self._fields.get(field_name)
-        
-        # Try fallback names if primary not found
-        if value is None and fallback_names:
-            for fallback in fallback_names:
-                value = self._fields.get(fallback)
-                if value is not None:
-                    break
+        value = self._lookup_field(field_name, fallback_names)
         
         if not isinstance(value, list):
-            return []
+            return ()
         
-        files = []
-        for item in value:
-            if isinstance(item, dict) and 'url' in item:
-                file_info = FileInfo(
-                    id=item.get('id', ''),
-                    name=item.get('name', 'file'),
-                    url=item['url'],
-                    mime_type=item.get('mimeType', ''),
-                    size=item.get('size', 0)
-                )
-                files.append(file_info)
+        return tuple(
+            FileInfo(
+                id=item.get('id', ''),
+                name=item.get('name', 'file'),
+                url=item['url'],
+                mime_type=item.get('mimeType', ''),
+                size=item.get('size', 0)
+            )
+            for item in value
+            if isinstance(item, dict) and 'url' in item
+        )
+    
+    def _field_names(self, field: str) -> Optional[Tuple[str, Optional[List[str]]]]:
+        """
+        Get the form field name and fallback names for a brand-specific field
         
-        return files
+        Returns:
+            Tuple of (field name, fallback names), or None if the field does not apply to this brand
+        """
+        brand_fields = BRAND_FIELD_NAMES.get(self._brand_key)
+        if brand_fields and field in brand_fields:
+            return brand_fields[field]
+        return DEFAULT_FIELD_NAMES.get(field)
     
     # Company Information Properties
-    @property
+    @cached_property
     def empresa(self) -> str:
         """Company name"""
         return self._get_field_value('Empresa')
     
-    @property
+    @cached_property
     def nif_cif(self) -> str:
         """Company tax ID"""
         return self._get_field_value('NIF/CIF/VAT')
     
-    @property
+    @cached_property
     def email(self) -> str:
         """Company email"""
         return self._get_field_value('Email')
     
     # Product Information Properties
-    @property
+    @cached_property
     def brand(self) -> str:
         """Product brand"""
         return self._get_field_value('Marca del Producto')
     
-    @property
+    @cached_property
     def modelo(self) -> str:
         """Product model - handles both unified and brand-specific fields"""
-        if self.is_conway():
-            # Conway uses text input for model
-            return self._get_field_value(
-                'Conway - Modelo',
-                ['Conway - Por favor, indica el nombre completo del modelo (ej. Cairon C 2.0 500)']
-            )
-        elif self.is_cycplus():
-            # Cycplus uses unified dropdown or brand-specific
-            return self._get_field_value('Modelo', ['Cycplus - Modelo'])
-        elif self.is_dare():
-            # Dare uses unified dropdown or brand-specific
-            return self._get_field_value('Modelo', ['Dare - Modelo'])
-        elif self.is_kogel():
-            return self._get_field_value('Kogel - Modelo', ['Modelo'])
-        else:
-            return self._get_field_value('Modelo')
+        return self._get_field_value(*self._field_names('modelo'))
     
-    @property
+    @cached_property
     def talla(self) -> str:
         """Product size - only for Conway and Dare"""
-        if self.is_conway():
-            return self._get_field_value('Talla', ['Conway - Talla'])
-        elif self.is_dare():
-            return self._get_field_value('Talla', ['Dare - Talla'])
-        else:
-            return 'No aplicable'
+        field_names = self._field_names('talla')
+        return self._get_field_value(*field_names) if field_names else NOT_APPLICABLE
     
-    @property
+    @cached_property
     def año(self) -> str:
         """Manufacturing year"""
-        if self.is_conway():
-            return self._get_field_value('Año de fabricación', ['Conway - Año de fabricación'])
-        elif self.is_dare():
-            return self._get_field_value('Año de fabricación', ['Dare - Año de fabricación'])
-        else:
-            return self._get_field_value('Año de fabricación')
+        return self._get_field_value(*self._field_names('año'))
     
-    @property
+    @cached_property
     def estado(self) -> str:
         """Product condition"""
-        if self.is_conway():
-            return self._get_field_value('Estado del producto', ['Conway - Estado de la bicicleta'])
-        elif self.is_cycplus():
-            return self._get_field_value('Estado del producto', ['Cycplus - Estado del Producto'])
-        elif self.is_dare():
-            return self._get_field_value('Estado del producto', ['Dare - Estado de la bicicleta'])
-        else:
-            return self._get_field_value('Estado del producto')
+        return self._get_field_value(*self._field_names('estado'))
     
     # Problem Information Properties
-    @property
+    @cached_property
     def problema(self) -> str:
         """Problem description"""
         return self._get_field_value(
@@ -272,105 +389,73 @@ class WarrantyFormData:
             ]
         )
     
-    @property
+    @cached_property
     def solucion(self) -> str:
         """Proposed solution - only for Conway and Dare"""
-        if self.is_conway():
-            return self._get_field_value(
-                'Solución o reparación propuesta y presupuesto',
-                ['Solución o reparación propuesta y presupuesto aproximado', 'Conway - Solución o reparación propuesta y presupuesto aproximado']
-            )
-        elif self.is_dare():
-            return self._get_field_value(
-                'Solución o reparación propuesta y presupuesto',
-                ['Solución o reparación propuesta y presupuesto aproximado', 'Dare - Solución o reparación propuesta y presupuesto aproximado']
-            )
-        else:
-            return 'No aplicable'
+        field_names = self._field_names('solucion')
+        return self._get_field_value(*field_names) if field_names else NOT_APPLICABLE
     
     # File Attachment Properties
-    @property
-    def factura_compra(self) -> List[FileInfo]:
+    @cached_property
+    def factura_compra(self) -> Tuple[FileInfo, ...]:
         """Purchase invoice files"""
-        if self.is_conway():
-            return self._get_file_list(
-                'Factura de compra',
-                ['Conway - Adjunta la factura de compra a Hartje']
-            )
-        elif self.is_cycplus():
-            return self._get_file_list(
-                'Factura de compra',
-                ['Adjunta la factura de compra']
-            )
-        elif self.is_dare():
-            return self._get_file_list(
-                'Factura de compra',
-                ['Dare - Adjunta la factura de compra']
-            )
-        else:
-            return self._get_file_list('Factura de compra')
+        return self._get_file_list(*self._field_names('factura_compra'))
     
-    @property
-    def factura_venta(self) -> List[FileInfo]:
+    @cached_property
+    def factura_venta(self) -> Tuple[FileInfo, ...]:
         """Sales invoice files"""
-        if self.is_conway():
-            return self._get_file_list(
-                'Factura de venta',
-                ['Conway - Adjunta la factura de venta']
-            )
-        elif self.is_cycplus():
-            return self._get_file_list(
-                'Factura de venta',
-                ['Cycplus - Adjunta la factura de venta']
-            )
-        elif self.is_dare():
-            return self._get_file_list(
-                'Factura de venta',
-                ['Dare - Adjunta la factura de venta']
-            )
-        else:
-            return self._get_file_list('Factura de venta')
+        return self._get_file_list(*self._field_names('factura_venta'))
     
-    @property
-    def fotos_problema(self) -> List[FileInfo]:
+    @cached_property
+    def fotos_problema(self) -> Tuple[FileInfo, ...]:
         """Problem photos"""
         return self._get_file_list('Fotos del problema (requerido)')
     
-    @property
-    def videos_problema(self) -> List[FileInfo]:
+    @cached_property
+    def videos_problema(self) -> Tuple[FileInfo, ...]:
         """Problem videos"""
         return self._get_file_list('Videos del problema (opcional)', ['Vídeos del problema (opcional)'])
     
+    @property
+    def fecha_creacion(self) -> str:
+        """Creation date and time shown in the emails"""
+        return self._fecha_creacion
+    
+    @property
+    def fecha_creacion_excel(self) -> str:
+        """Creation date written to the Excel sheet"""
+        return self._fecha_creacion_excel
+    
     # Brand Detection Methods
+    @cached_property
+    def _brand_key(self) -> str:
+        """Lowercase brand used for brand checks, interned so the comparisons below hit the identity fast path"""
+        return sys.intern(self.brand.lower())
+    
     def is_conway(self) -> bool:
         """Check if this is a Conway warranty request"""
-        return self.brand.lower() == 'conway'
+        return self._brand_key == 'conway'
     
     def is_cycplus(self) -> bool:
         """Check if this is a Cycplus warranty request"""
-        return self.brand.lower() == 'cycplus'
+        return self._brand_key == 'cycplus'
     
     def is_dare(self) -> bool:
         """Check if this is a Dare warranty request"""
-        return self.brand.lower() == 'dare'
+        return self._brand_key == 'dare'
     
     def is_kogel(self) -> bool:
         """Check if this is a Kogel warranty request"""
-        return self.brand.lower() == 'kogel'
+        return self._brand_key == 'kogel'
     
     # Utility Methods
-    def get_all_files(self) -> List[FileInfo]:
+    def get_all_files(self) -> Tuple[FileInfo, ...]:
         """Get all file attachments"""
-        all_files = []
-        all_files.extend(self.factura_compra)
-        all_files.extend(self.factura_venta)
-        all_files.extend(self.fotos_problema)
-        all_files.extend(self.videos_problema)
-        return all_files
+        return self.factura_compra + self.factura_venta + self.fotos_problema + self.videos_problema
     
     def has_invoices(self) -> bool:
         """Check if any invoice files are attached"""
-        return len(self.factura_compra) > 0 or len(self.factura_venta) > 0
+        return bool(self.factura_compra or self.factura_venta)
     
     def to_excel_row(self, brand: str) -> Dict[str, Any]:
         """
@@ -382,91 +467,12 @@ class WarrantyFormData:
         Returns:
             Dictionary with Excel column names and values
         """
-        fecha_creacion = datetime.now().strftime('%d/%m/%Y')
-        
-        if brand == 'Conway':
-            return {
-                'Ticket ID': self.ticket_id,
-                'Estado': 'Recibida',
-                'Fecha de creación': fecha_creacion,
-                'Empresa': self.empresa,
-                'NIF/CIF/VAT': self.nif_cif,
-                'Email': self.email,
-                'Modelo': self.modelo,
-                'Talla': self.talla,
-                'Año de fabricación': self.año,
-                'Estado de la bicicleta': self.estado,
-                'Descripción del problema': self.problema,
-                'Solución y/o reparación propuesta y presupuesto': self.solucion,
-                'Factura de compra': {'type': 'hyperlink', 'url': self.factura_compra[0].url, 'text': self.factura_compra[0].name} if self.factura_compra else '',
-                'Factura de venta': {'type': 'hyperlink', 'url': self.factura_venta[0].url, 'text': self.factura_venta[0].name} if self.factura_venta else '',
-                'Imágenes': {'type': 'hyperlink', 'url': self.fotos_problema[0].url, 'text': self.fotos_problema[0].name} if self.fotos_problema else '',
-                'Vídeos': {'type': 'hyperlink', 'url': self.videos_problema[0].url, 'text': self.videos_problema[0].name} if self.videos_problema else ''
-            }
-        elif brand == 'Cycplus':
-            return {
-                'Ticket ID': self.ticket_id,
-                'Estado': 'Recibida',
-                'Fecha de creación': fecha_creacion,
-                'Empresa': self.empresa,
-                'NIF/CIF/VAT': self.nif_cif,
-                'Email': self.email,
-                'Modelo': self.modelo,
-                'Estado del producto': self.estado,
-                'Descripción del problema': self.problema,
-                'Solución y/o reparación propuesta y presupuesto': 'No aplicable',
-                'Factura de compra': {'type': 'hyperlink', 'url': self.factura_compra[0].url, 'text': self.factura_compra[0].name} if self.factura_compra else '',
-                'Factura de venta': {'type': 'hyperlink', 'url': self.factura_venta[0].url, 'text': self.factura_venta[0].name} if self.factura_venta else '',
-                'Imágenes': {'type': 'hyperlink', 'url': self.fotos_problema[0].url, 'text': self.fotos_problema[0].name} if self.fotos_problema else '',
-                'Vídeos': {'type': 'hyperlink', 'url': self.videos_problema[0].url, 'text': self.videos_problema[0].name} if self.videos_problema else ''
-            }
-        elif brand == 'Dare':
-            return {
-                'Ticket ID': self.ticket_id,
-                'Estado': 'Recibida',
-                'Fecha de creación': fecha_creacion,
-                'Empresa': self.empresa,
-                'NIF/CIF/VAT': self.nif_cif,
-                'Email': self.email,
-                'Modelo': self.modelo,
-                'Talla': self.talla,
-                'Estado de la bicicleta': self.estado,
-                'Descripción del problema': self.problema,
-                'Solución y/o reparación propuesta y presupuesto': self.solucion,
-                'Factura de compra': {'type': 'hyperlink', 'url': self.factura_compra[0].url, 'text': self.factura_compra[0].name} if self.factura_compra else '',
-                'Factura de venta': {'type': 'hyperlink', 'url': self.factura_venta[0].url, 'text': self.factura_venta[0].name} if self.factura_venta else '',
-                'Imágenes': {'type': 'hyperlink', 'url': self.fotos_problema[0].url, 'text': self.fotos_problema[0].name} if self.fotos_problema else '',
-                'Vídeos': {'type': 'hyperlink', 'url': self.videos_problema[0].url, 'text': self.videos_problema[0].name} if self.videos_problema else ''
-            }
-        elif brand == 'Kogel':
-            return {
-                'Ticket ID': self.ticket_id,
-                'Estado': 'Recibida',
-                'Fecha de creación': fecha_creacion,
-                'Empresa': self.empresa,
-                'NIF/CIF/VAT': self.nif_cif,
-                'Email': self.email,
-                'Modelo': self.modelo,
-                'Estado del producto': self.estado,
-                'Descripción del problema': self.problema,
-                'Solución y/o reparación propuesta y presupuesto': 'No aplicable',
-                'Factura de compra': {'type': 'hyperlink', 'url': self.factura_compra[0].url, 'text': self.factura_compra[0].name} if self.factura_compra else '',
-                'Factura de venta': {'type': 'hyperlink', 'url': self.factura_venta[0].url, 'text': self.factura_venta[0].name} if self.factura_venta else '',
-                'Imágenes': {'type': 'hyperlink', 'url': self.fotos_problema[0].url, 'text': self.fotos_problema[0].name} if self.fotos_problema else '',
-                'Vídeos': {'type': 'hyperlink', 'url': self.videos_problema[0].url, 'text': self.videos_problema[0].name} if self.videos_problema else ''
-            }
-        else:
-            # Generic format
-            return {
-                'Ticket ID': self.ticket_id,
-                'Estado': 'Recibida',
-                'Fecha de creación': fecha_creacion,
-                'Empresa': self.empresa,
-                'NIF/CIF/VAT': self.nif_cif,
-                'Email': self.email,
-                'Modelo': self.modelo,
-                'Descripción del problema': self.problema
-            }
+        columns = EXCEL_ROW_COLUMNS.get(brand, GENERIC_EXCEL_ROW_COLUMNS)
+        fixed_values = EXCEL_FIXED_VALUES.get(brand, {})
+        return {
+            column: fixed_values[column] if column in fixed_values else EXCEL_COLUMN_VALUES[column](self)
+            for column in columns
+        }
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -491,7 +497,7 @@ class WarrantyFormData:
             'factura_venta_count': len(self.factura_venta),
             'fotos_count': len(self.fotos_problema),
             'videos_count': len(self.videos_problema),
-            'fecha_creacion': datetime.now().strftime('%d/%m/%Y %H:%M')
+            'fecha_creacion': self.fecha_creacion
         }
     
     def __str__(self) -> str:
@@ -8,8 +8,8 @@ in logs that may be exposed in public repositories or monitoring systems.
 import re
 import json
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Union, Optional
-from copy import deepcopy
 
 
 class SensitiveDataFilter(logging.Filter):
@@ -113,6 +113,80 @@ class SensitiveDataFilter(logging.Filter):
         re.IGNORECASE
     )
     
+    # Any digit, checked before the number based patterns
+    DIGIT_PATTERN = re.compile(r'\d')
+    
+    # Contextual patterns, compiled once instead of on every log record
+    
+    # Common company name patterns (ending with S.L., S.A., Ltd., etc.)
+    COMPANY_PATTERN = re.compile(
+        r'[A-Za-z][A-Za-z\s&.-]*(?:S\.L\.|S\.A\.|Ltd\.?|Inc\.?|LLC|GmbH|B\.V\.)',
+        re.IGNORECASE
+    )
+    
+    # Product model patterns (brand + model with numbers/letters)
+    PRODUCT_PATTERN = re.compile(
+        r'\b(?:Conway|Cycplus|Dare|Kogel)\s+[A-Za-z0-9\s.-]+(?:\d+\.?\d*|\d+)\b',
+        re.IGNORECASE
+    )
+    
+    # Price patterns (numbers with currency symbols)
+    PRICE_PATTERN = re.compile(
+        r'\d{1,6}(?:[.,]\d{1,2})?\s*[€$£¥]',
+        re.IGNORECASE
+    )
+    
+    # Spanish phone patterns
+    SPANISH_PHONE_PATTERN = re.compile(
+        r'\+34\s*\d{3}\s*\d{3}\s*\d{3}',
+        re.IGNORECASE
+    )
+    
+    # File paths and folder names
+    FILE_PATH_PATTERN = re.compile(
+        r'(?:form_submission/tests/|form_submission/src/|/[A-Z_]+/)[A-Za-z0-9_./\\-]+\.(?:json|py|xlsx|pdf|csv|txt)',
+        re.IGNORECASE
+    )
+    
+    # Dropbox paths and file names
+    DROPBOX_PATH_PATTERN = re.compile(
+        r'/[A-Z_]+/[A-Za-z0-9_]+\.xlsx',
+        re.IGNORECASE
+    )
+    
+    # Event IDs (test-brand-numbers pattern)
+    EVENT_ID_PATTERN = re.compile(
+        r'test-[a-z]+-\d+',
+        re.IGNORECASE
+    )
+    
+    # Event types (FORM_RESPONSE, etc.)
+    EVENT_TYPE_PATTERN = re.compile(
+        r'\b(?:FORM_RESPONSE|WEBHOOK_EVENT|API_CALL|USER_ACTION)\b',
+        re.IGNORECASE
+    )
+    
+    # Legal-form suffixes every COMPANY_PATTERN match ends with. Searching for the
+    # suffix alone is linear, while COMPANY_PATTERN rescans the rest of the text
+    # from every letter.
+    COMPANY_SUFFIX_PATTERN = re.compile(
+        r'S\.L\.|S\.A\.|Ltd|Inc|LLC|GmbH|B\.V\.',
+        re.IGNORECASE
+    )
+    
+    # All contextual patterns as one alternation (companies via their suffix), used
+    # to skip the individual passes when none of them can match
+    CONTEXTUAL_PATTERN = re.compile(
+        '|'.join(f'(?:{pattern.pattern})' for pattern in (
+            COMPANY_SUFFIX_PATTERN, PRODUCT_PATTERN, PRICE_PATTERN, SPANISH_PHONE_PATTERN,
+            FILE_PATH_PATTERN, DROPBOX_PATH_PATTERN, EVENT_ID_PATTERN, EVENT_TYPE_PATTERN
+        )),
+        re.IGNORECASE
+    )
+    
+    # Masked remainder of a UUID after its first 8 characters
+    UUID_MASK_SUFFIX = f"-{'*' * 4}-{'*' * 4}-{'*' * 4}-{'*' * 12}"
+    
     def __init__(self, mask_char: str = '*', preserve_length: bool = True):
         """
         Initialize the sensitive data filter.
@@ -125,11 +199,27 @@ class SensitiveDataFilter(logging.Filter):
         self.mask_char = mask_char
         self.preserve_length = preserve_length
         
-        # Compile sensitive field patterns
-        self.sensitive_patterns = [
-            re.compile(pattern, re.IGNORECASE) 
-            for pattern in self.SENSITIVE_FIELD_PATTERNS
-        ]
+        # Compile sensitive field patterns into one alternation, so a key is
+        # checked with a single search
+        self.sensitive_key_pattern = re.compile(
+            '|'.join(self.SENSITIVE_FIELD_PATTERNS),
+            re.IGNORECASE
+        )
+        
+        # Webhook payloads repeat the same few keys, so remember each decision
+        self._is_sensitive_key = lru_cache(maxsize=512)(self._match_sensitive_key)
+    
+    def _match_sensitive_key(self, key: str) -> bool:
+        """
+        Check whether a dictionary key names sensitive data.
+        
+        Args:
+            key: Dictionary key to check
+            
+        Returns:
+            True if the key matches any sensitive field pattern
+        """
+        return self.sensitive_key_pattern.search(key) is not None
     
     def filter(self, record: logging.LogRecord) -> bool:
         """
@@ -167,35 +257,43 @@ class SensitiveDataFilter(logging.Filter):
         # Make a copy to work with
         sanitized = text
         
+        # Each pass only runs if the text contains something it needs to match
+        # (an '@', a digit, '://' or a '-'), which most log messages lack
+        
         # Sanitize emails
-        sanitized = self.EMAIL_PATTERN.sub(
-            lambda m: self._mask_sensitive_data(m.group(0), 'email'),
-            sanitized
-        )
+        if '@' in sanitized:
+            sanitized = self.EMAIL_PATTERN.sub(
+                lambda m: self._mask_sensitive_data(m.group(0), 'email'),
+                sanitized
+            )
         
         # Sanitize NIF/CIF/VAT numbers
-        sanitized = self.NIF_CIF_PATTERN.sub(
-            lambda m: self._mask_sensitive_data(m.group(0), 'nif'),
-            sanitized
-        )
+        if self.DIGIT_PATTERN.search(sanitized):
+            sanitized = self.NIF_CIF_PATTERN.sub(
+                lambda m: self._mask_sensitive_data(m.group(0), 'nif'),
+                sanitized
+            )
         
         # Sanitize URLs
-        sanitized = self.URL_PATTERN.sub(
-            lambda m: self._mask_sensitive_data(m.group(0), 'url'),
-            sanitized
-        )
+        if '://' in sanitized:
+            sanitized = self.URL_PATTERN.sub(
+                lambda m: self._mask_sensitive_data(m.group(0), 'url'),
+                sanitized
+            )
         
         # Sanitize phone numbers
-        sanitized = self.PHONE_PATTERN.sub(
-            lambda m: self._mask_sensitive_data(m.group(0), 'phone'),
-            sanitized
-        )
+        if self.DIGIT_PATTERN.search(sanitized):
+            sanitized = self.PHONE_PATTERN.sub(
+                lambda m: self._mask_sensitive_data(m.group(0), 'phone'),
+                sanitized
+            )
         
         # Sanitize UUIDs (keep first 8 chars for debugging)
-        sanitized = self.UUID_PATTERN.sub(
-            lambda m: f"{m.group(0)[:8]}-{'*' * 4}-{'*' * 4}-{'*' * 4}-{'*' * 12}",
-            sanitized
-        )
+        if '-' in sanitized:
+            sanitized = self.UUID_PATTERN.sub(
+                lambda m: m.group(0)[:8] + self.UUID_MASK_SUFFIX,
+                sanitized
+            )
         
         # Context-aware sanitization for common patterns
         sanitized = self._sanitize_contextual_data(sanitized)
@@ -215,67 +313,40 @@ class SensitiveDataFilter(logging.Filter):
         if not text:
             return text
         
+        # One scan for the common case of a message with nothing to mask
+        if not self.CONTEXTUAL_PATTERN.search(text):
+            return text
+        
         # Common company name patterns (ending with S.L., S.A., Ltd., etc.)
-        company_pattern = re.compile(
-            r'[A-Za-z][A-Za-z\s&.-]*(?:S\.L\.|S\.A\.|Ltd\.?|Inc\.?|LLC|GmbH|B\.V\.)',
-            re.IGNORECASE
-        )
-        text = company_pattern.sub(
-            lambda m: self._mask_sensitive_data(m.group(0), 'empresa'),
-            text
-        )
+        if self.COMPANY_SUFFIX_PATTERN.search(text):
+            text = self.COMPANY_PATTERN.sub(
+                lambda m: self._mask_sensitive_data(m.group(0), 'empresa'),
+                text
+            )
         
         # Product model patterns (brand + model with numbers/letters)
-        product_pattern = re.compile(
-            r'\b(?:Conway|Cycplus|Dare|Kogel)\s+[A-Za-z0-9\s.-]+(?:\d+\.?\d*|\d+)\b',
-            re.IGNORECASE
-        )
-        text = product_pattern.sub(
+        text = self.PRODUCT_PATTERN.sub(
             lambda m: self._mask_sensitive_data(m.group(0), 'modelo'),
             text
         )
         
         # Price patterns (numbers with currency symbols) - simplified
-        price_pattern = re.compile(
-            r'\d{1,6}(?:[.,]\d{1,2})?\s*[€$£¥]',
-            re.IGNORECASE
-        )
-        text = price_pattern.sub('[PRICE_MASKED]', text)
+        text = self.PRICE_PATTERN.sub('[PRICE_MASKED]', text)
         
         # Spanish phone patterns
-        spanish_phone_pattern = re.compile(
-            r'\+34\s*\d{3}\s*\d{3}\s*\d{3}',
-            re.IGNORECASE
-        )
-        text = spanish_phone_pattern.sub('[PHONE_MASKED]', text)
+        text = self.SPANISH_PHONE_PATTERN.sub('[PHONE_MASKED]', text)
         
         # File paths and folder names
-        file_path_pattern = re.compile(
-            r'(?:form_submission/tests/|form_submission/src/|/[A-Z_]+/)[A-Za-z0-9_./\\-]+\.(?:json|py|xlsx|pdf|csv|txt)',
-            re.IGNORECASE
-        )
-        text = file_path_pattern.sub('[FILE_PATH_MASKED]', text)
+        text = self.FILE_PATH_PATTERN.sub('[FILE_PATH_MASKED]', text)
         
         # Dropbox paths and file names
-        dropbox_path_pattern = re.compile(
-            r'/[A-Z_]+/[A-Za-z0-9_]+\.xlsx',
-            re.IGNORECASE
-        )
-        text = dropbox_path_pattern.sub('[DROPBOX_PATH_MASKED]', text)
+        text = self.DROPBOX_PATH_PATTERN.sub('[DROPBOX_PATH_MASKED]', text)
         
         # Event IDs (test-brand-numbers pattern)
-        event_id_pattern = re.compile(
-            r'test-[a-z]+-\d+',
-            re.IGNORECASE
-        )
-        text = event_id_pattern.sub('[EVENT_ID_MASKED]', text)
+        text = self.EVENT_ID_PATTERN.sub('[EVENT_ID_MASKED]', text)
         
         # Event types (FORM_RESPONSE, etc.) - be more specific
-        event_type_pattern = re.compile(
-            r'\b(?:FORM_RESPONSE|WEBHOOK_EVENT|API_CALL|USER_ACTION)\b',
-            re.IGNORECASE
-        )
-        text = event_type_pattern.sub('[EVENT_TYPE_MASKED]', text)
+        text = self.EVENT_TYPE_PATTERN.sub('[EVENT_TYPE_MASKED]', text)
         
         return text
     
@@ -289,6 +360,10 @@ class SensitiveDataFilter(logging.Filter):
         Returns:
             Sanitized arguments tuple
         """
+        # Common case: every argument is a plain string
+        if all(type(arg) is str for arg in args):
+            return tuple(self._sanitize_text(arg) for arg in args)
+        
         sanitized_args = []
         
         for arg in args:
@@ -321,9 +396,7 @@ class SensitiveDataFilter(logging.Filter):
         
         for key, value in data.items():
             # Check if key is sensitive
-            is_sensitive_key = any(
-                pattern.search(key) for pattern in self.sensitive_patterns
-            )
+            is_sensitive_key = self._is_sensitive_key(key)
             
             if is_sensitive_key:
                 # Mask the value
@@ -332,7 +405,8 @@ class SensitiveDataFilter(logging.Filter):
                 elif isinstance(value, (int, float)):
                     sanitized[key] = self._mask_numeric_data(value)
                 elif isinstance(value, list):
-                    sanitized[key] = [self._mask_sensitive_data(str(item), key.lower()) for item in value]
+                    data_type = key.lower()
+                    sanitized[key] = [self._mask_sensitive_data(str(item), data_type) for item in value]
                 else:
                     sanitized[key] = '[MASKED]'
             else:
@@ -395,27 +469,28 @@ class SensitiveDataFilter(logging.Filter):
             return data_str
         
         # Context-aware masking strategies
-        if data_type.lower() in ['email', 'mail']:
+        data_type = data_type.lower()
+        if data_type in ('email', 'mail'):
             # For emails, show first char + domain
             if '@' in data_str:
                 local, domain = data_str.split('@', 1)
                 return f"{local[0]}{'*' * (len(local) - 1)}@{domain}"
             
-        elif data_type.lower() in ['nif', 'cif', 'vat']:
+        elif data_type in ('nif', 'cif', 'vat'):
             # For ID numbers, show first 2 and last 1 characters
             if len(data_str) >= 4:
                 return f"{data_str[:2]}{'*' * (len(data_str) - 3)}{data_str[-1]}"
             
-        elif data_type.lower() in ['phone', 'telefono']:
+        elif data_type in ('phone', 'telefono'):
             # For phones, show country code and mask the rest
             if len(data_str) >= 6:
                 return f"{data_str[:3]}{'*' * (len(data_str) - 3)}"
         
-        elif data_type.lower() in ['url', 'link']:
+        elif data_type in ('url', 'link'):
             # For URLs, show domain but mask path
             return '[URL_MASKED]'
         
-        elif data_type.lower() in ['empresa', 'company']:
+        elif data_type in ('empresa', 'company'):
             # For company names, show first few chars
             if len(data_str) >= 3:
                 return f"{data_str[:3]}{'*' * (len(data_str) - 3)}"
@@ -488,8 +563,8 @@ def setup_secure_logging(
     logger.setLevel(level)
     
     # Remove existing handlers to avoid duplicates
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
+    while logger.handlers:
+        logger.removeHandler(logger.handlers[-1])
     
     # Create console handler
     console_handler = logging.StreamHandler()
@@ -7,10 +7,13 @@ Reads warranty tickets from Dropbox Excel file and extracts status information
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import sys
+import shutil
+import tempfile
 from datetime import datetime
-from io import BytesIO
 from typing import Dict, List, Any
 from dotenv import load_dotenv
 
@@ -23,12 +26,27 @@ load_dotenv()
 # Set up secure logging
 logger = setup_secure_logging('excel_reader')
 
+# Downloads larger than this spill from memory to a temporary file on disk
+DOWNLOAD_SPOOL_SIZE = 8 * 1024 * 1024
+
 class ExcelReader:
     """Handles reading warranty data from Dropbox Excel file"""
     
     def __init__(self):
         self.access_token = None
         self.file_path = None
+        # One keep-alive session for the token exchange and every download.
+        # Dropbox rate limits (429) and transient gateway errors are retried with backoff;
+        # both calls are POSTs, so POST has to be allowed explicitly.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'HEAD', 'POST']),
+            raise_on_status=False
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
         self._initialize_dropbox()
     
     def _initialize_dropbox(self):
@@ -56,7 +74,7 @@ class ExcelReader:
             'client_secret': app_secret
         }
         
-        response = requests.post(url, data=data)
+        response = self.session.post(url, data=data)
         if response.status_code == 200:
             return response.json()['access_token']
         else:
@@ -70,11 +88,20 @@ class ExcelReader:
             'Dropbox-API-Arg': json.dumps({'path': self.file_path})
         }
         
-        response = requests.post(url, headers=headers)
-        if response.status_code == 200:
-            return BytesIO(response.content)
-        else:
-            raise Exception(f"Failed to download file: {response.text}")
+        with self.session.post(url, headers=headers, stream=True) as response:
+            if response.status_code != 200:
+                raise Exception(f"Failed to download file: {response.text}")
+            
+            # Stream the body instead of holding the whole response in memory first
+            excel_file = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_SIZE)
+            try:
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, excel_file)
+                excel_file.seek(0)
+            except Exception:
+                excel_file.close()
+                raise
+            return excel_file
     
     def get_all_tickets_status(self) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -86,11 +113,10 @@ class ExcelReader:
         try:
             logger.info("Starting to read Excel file from Dropbox")
             
-            # Download Excel file
-            excel_file = self._download_excel_from_dropbox()
-            
-            # Read all sheets
-            excel_data = pd.read_excel(excel_file, sheet_name=None, engine='openpyxl')
+            # Download Excel file and read all sheets; closing the download
+            # removes its temporary file once it has spilled to disk
+            with self._download_excel_from_dropbox() as excel_file:
+                excel_data = pd.read_excel(excel_file, sheet_name=None, engine='openpyxl')
             
             all_tickets = {}
             brands = ['Conway', 'Cycplus', 'Dare', 'Kogel']
@@ -103,13 +129,12 @@ class ExcelReader:
                 df = excel_data[brand]
                 tickets = []
                 
+                # Blank out missing values for the whole sheet at once instead of checking every cell.
+                # fillna would leave NaT in date columns, so mask on notna() over object values.
+                records = df.astype(object).where(df.notna(), '').to_dict('records')
+                
                 # Process each row (pandas automatically handles headers)
-                for _, row in df.iterrows():
-                    # Extract ticket data
-                    ticket_data = {}
-                    for col in df.columns:
-                        ticket_data[col] = row[col] if pd.notna(row[col]) else ''
-                    
+                for ticket_data in records:
                     # Add brand information
                     ticket_data['Brand'] = brand
                     